@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+from jobs.gazetteer import geocode
+
+
+def geocode_profiles(apps, schema_editor):
+    for model_name in ('JobSeekerProfile', 'EmployerProfile'):
+        model = apps.get_model('accounts', model_name)
+        for pk, city, state, country in model.objects.exclude(city='').values_list(
+            'pk', 'city', 'state', 'country'
+        ):
+            point = geocode(city, state, country)
+            if point:
+                model.objects.filter(pk=pk).update(latitude=point[0], longitude=point[1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employerprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='employerprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='latitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobseekerprofile',
+            name='longitude',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(geocode_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employerprofile',
+            name='active_jobs_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
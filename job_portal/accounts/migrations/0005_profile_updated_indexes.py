@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_date_joined_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employerprofile',
+            index=models.Index(fields=['updated_at'], name='employer_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobseekerprofile',
+            index=models.Index(fields=['updated_at'], name='seeker_updated_idx'),
+        ),
+    ]
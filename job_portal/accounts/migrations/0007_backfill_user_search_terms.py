@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def backfill_search_terms(apps, schema_editor):
+    """Index existing users' username, email and names (as accounts.models.user_search_terms)"""
+    User = apps.get_model('accounts', 'User')
+    UserSearchTerm = apps.get_model('accounts', 'UserSearchTerm')
+
+    rows = []
+    for pk, username, email, first_name, last_name in User.objects.values_list(
+        'pk', 'username', 'email', 'first_name', 'last_name'
+    ).iterator():
+        names = [username, email, first_name, last_name, f'{first_name} {last_name}']
+        terms = {' '.join(name.lower().split())[:255] for name in names}
+        rows.extend(UserSearchTerm(user_id=pk, term=term) for term in terms if term)
+        if len(rows) >= 5000:
+            UserSearchTerm.objects.bulk_create(rows, ignore_conflicts=True)
+            rows = []
+    UserSearchTerm.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_user_search_terms'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_terms, migrations.RunPython.noop),
+    ]
@@ -6,6 +6,10 @@ from django.urls import reverse
 from PIL import Image
 import os
 
+from jobs.counters import preserve_counters
+from jobs.gazetteer import geocode
+from jobs.skills import split_skills
+
 class User(AbstractUser):
     """Custom User model with role-based authentication"""
     
@@ -25,6 +29,15 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'user_type']
     
+    class Meta:
+        indexes = [
+            # Registration time series and "joined since" counts in admin analytics
+            models.Index(fields=['date_joined'], name='user_date_joined_idx'),
+            # Admin user management filters, newest first
+            models.Index(fields=['user_type', 'is_active', 'date_joined'], name='user_type_active_joined_idx'),
+            models.Index(fields=['is_active', 'date_joined'], name='user_active_joined_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.email} ({self.get_user_type_display()})"
     
@@ -35,6 +48,59 @@ class User(AbstractUser):
             return reverse('accounts:employer_profile')
         return reverse('accounts:profile')
 
+def normalize_search_term(text):
+    """Lowercase with whitespace collapsed, as user search terms are stored"""
+    return ' '.join(text.lower().split())[:UserSearchTerm.MAX_LENGTH]
+
+def user_search_terms(user):
+    """Keys a user is found under by prefix: username, email, first, last and full name"""
+    names = [user.username, user.email, user.first_name, user.last_name, f'{user.first_name} {user.last_name}']
+    return {term for term in map(normalize_search_term, names) if term}
+
+class UserSearchTermManager(models.Manager):
+    def user_ids(self, text):
+        """
+        Ids of users with a term starting with `text` (case-insensitive), for
+        use as a subquery. The prefix is matched as a range on the term index,
+        which works where LIKE 'text%' can't use it.
+        """
+        prefix = normalize_search_term(text)
+        if not prefix:
+            return self.values('user_id')
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return self.filter(term__gte=prefix, term__lt=upper).values('user_id')
+
+class UserSearchTerm(models.Model):
+    """Normalized search key of a user, maintained by sync_user_search_terms"""
+    
+    MAX_LENGTH = 255
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=MAX_LENGTH)
+    
+    objects = UserSearchTermManager()
+    
+    class Meta:
+        unique_together = ['user', 'term']
+        indexes = [
+            models.Index(fields=['term', 'user'], name='usersearchterm_term_idx'),
+        ]
+    
+    def __str__(self):
+        return self.term
+
+def sync_user_search_terms(user):
+    """Rebuild the UserSearchTerm rows from the user's username, email and name"""
+    wanted = user_search_terms(user)
+    existing = set(user.search_terms.values_list('term', flat=True))
+    if existing == wanted:
+        return
+    user.search_terms.exclude(term__in=wanted).delete()
+    UserSearchTerm.objects.bulk_create(
+        [UserSearchTerm(user=user, term=term) for term in wanted - existing],
+        ignore_conflicts=True
+    )
+
 class JobSeekerProfile(models.Model):
     """Profile for job seekers"""
     
@@ -62,6 +128,8 @@ class JobSeekerProfile(models.Model):
     state = models.CharField(max_length=100, blank=True)
     country = models.CharField(max_length=100, blank=True)
     postal_code = models.CharField(max_length=20, blank=True)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     
     # Professional Information
     headline = models.CharField(max_length=200, blank=True, help_text="Professional headline/title")
@@ -100,16 +168,31 @@ class JobSeekerProfile(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_profile_complete = models.BooleanField(default=False)
     
+    class Meta:
+        indexes = [
+            # Delta export range scans
+            models.Index(fields=['updated_at'], name='seeker_updated_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.get_full_name()} - Job Seeker"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded values so signals can tell what changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def get_loaded_value(self, attname):
+        """Value of `attname` when the row was loaded (None for new profiles)"""
+        return getattr(self, '_loaded_values', {}).get(attname)
+    
     def get_full_name(self):
         return f"{self.first_name} {self.last_name}".strip()
     
     def get_skills_list(self):
-        if self.skills:
-            return [skill.strip() for skill in self.skills.split(',')]
-        return []
+        return list(split_skills(self.skills))
     
     def get_desired_job_types_list(self):
         if self.desired_job_types:
@@ -134,7 +217,15 @@ class JobSeekerProfile(models.Model):
         # Update profile completeness
         self.is_profile_complete = self.calculate_profile_completeness() >= 70
         
+        # Geocode city from the offline gazetteer
+        point = geocode(self.city, self.state, self.country) if self.city else None
+        self.latitude, self.longitude = point or (None, None)
+        
         super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
         
         # Resize profile picture
         if self.profile_picture:
@@ -197,6 +288,8 @@ class EmployerProfile(models.Model):
     state = models.CharField(max_length=100, blank=True)
     country = models.CharField(max_length=100, blank=True)
     postal_code = models.CharField(max_length=20, blank=True)
+    latitude = models.FloatField(null=True, blank=True, editable=False)
+    longitude = models.FloatField(null=True, blank=True, editable=False)
     
     # Online Presence
     website = models.URLField(blank=True)
@@ -218,12 +311,34 @@ class EmployerProfile(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_profile_complete = models.BooleanField(default=False)
     
+    # Maintained by jobs.signals (verify_counters repairs drift)
+    active_jobs_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    COUNTER_FIELDS = ('active_jobs_count',)
+    
+    class Meta:
+        indexes = [
+            # Delta export range scans
+            models.Index(fields=['updated_at'], name='employer_updated_idx'),
+        ]
+    
     def __str__(self):
         return self.company_name
     
     def get_absolute_url(self):
         return reverse('accounts:employer_profile_public', kwargs={'pk': self.pk})
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded values so signals can tell what changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def get_loaded_value(self, attname):
+        """Value of `attname` when the row was loaded (None for new profiles)"""
+        return getattr(self, '_loaded_values', {}).get(attname)
+    
     def calculate_profile_completeness(self):
         """Calculate profile completion percentage"""
         fields_to_check = [
@@ -237,7 +352,16 @@ class EmployerProfile(models.Model):
         # Update profile completeness
         self.is_profile_complete = self.calculate_profile_completeness() >= 70
         
+        # Geocode city (or headquarters) from the offline gazetteer
+        point = geocode(self.city, self.state, self.country) if self.city else geocode(self.headquarters)
+        self.latitude, self.longitude = point or (None, None)
+        
+        preserve_counters(self, self.COUNTER_FIELDS, kwargs)
         super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
         
         # Resize company logo
         if self.company_logo:
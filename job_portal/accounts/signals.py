@@ -2,7 +2,10 @@
 
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from .models import User, JobSeekerProfile, EmployerProfile
+from .models import User, JobSeekerProfile, EmployerProfile, sync_user_search_terms
+
+# User fields the admin user search matches
+SEARCH_FIELDS = {'username', 'email', 'first_name', 'last_name'}
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -23,4 +26,11 @@ def save_user_profile(sender, instance, **kwargs):
     elif instance.user_type == 'employer':
         profile, created = EmployerProfile.objects.get_or_create(user=instance)
         if not created:
-            profile.save()
\ No newline at end of file
+            profile.save()
+
+@receiver(post_save, sender=User)
+def sync_search_terms_on_save(sender, instance, update_fields=None, **kwargs):
+    """Keep the user's prefix-search terms current (logins only touch last_login)"""
+    if update_fields and not SEARCH_FIELDS & set(update_fields):
+        return
+    sync_user_search_terms(instance)
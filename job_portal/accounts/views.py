@@ -98,23 +98,16 @@ def job_seeker_dashboard(request):
         applicant=profile
     ).select_related('job', 'job__company').order_by('-applied_date')[:5]
     
-    # Get recommended jobs (based on skills and preferences)
-    from jobs.models import Job
-    recommended_jobs = Job.objects.filter(status='active')
-    if profile.skills:
-        skills_list = profile.get_skills_list()
-        skill_query = Q()
-        for skill in skills_list:
-            skill_query |= Q(required_skills__icontains=skill)
-        recommended_jobs = recommended_jobs.filter(skill_query)
-    
-    recommended_jobs = recommended_jobs[:5]
+    # Get recommended jobs (scored against the seeker's skills and preferences)
+    from jobs.recommendations import recommend_jobs
+    recommended_jobs = recommend_jobs(profile, limit=5)
     
     context = {
         'profile': profile,
         'stats': stats,
         'recent_applications': recent_applications,
         'recommended_jobs': recommended_jobs,
+        'saved_searches': profile.saved_searches.all(),
     }
     
     return render(request, 'accounts/job_seeker_dashboard.html', context)
@@ -0,0 +1,274 @@
+# admin_panel/exports.py - Row-streaming data exports (CSV, optionally gzipped) for admins
+
+import csv
+import json
+import os
+import secrets
+import zlib
+from datetime import datetime, time, timedelta
+
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from accounts.models import User
+from jobs.models import Job, JobApplication
+from .models import ExportJob
+
+# Rows fetched per database round trip
+EXPORT_CHUNK_SIZE = 2000
+
+# Bytes of CSV collected before a chunk is sent (and compressed)
+STREAM_BUFFER_SIZE = 64 * 1024
+
+# A running background export whose worker hasn't checkpointed for this long is taken over
+EXPORT_STALE_SECONDS = 300
+
+# Background exports are written under PRIVATE_MEDIA_ROOT/<EXPORT_DIR>
+EXPORT_DIR = 'exports'
+
+
+class Echo:
+    """File-like object whose write() hands the line back, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _parse_day(value):
+    try:
+        return parse_date(value or '')
+    except ValueError:
+        return None
+
+
+def application_filters(params):
+    """
+    Queryset filters from export parameters: start/end (YYYY-MM-DD, inclusive),
+    status and company (id). Invalid values are ignored.
+    """
+    filters = {}
+    start, end = _parse_day(params.get('start')), _parse_day(params.get('end'))
+    if start:
+        filters['applied_date__gte'] = _local_midnight(start)
+    if end:
+        filters['applied_date__lt'] = _local_midnight(end + timedelta(days=1))
+    status = params.get('status')
+    if status in dict(JobApplication.STATUS_CHOICES):
+        filters['status'] = status
+    company = params.get('company')
+    if company and str(company).isdigit():
+        filters['job__company_id'] = int(company)
+    return filters
+
+
+def _date(value):
+    return value.strftime('%Y-%m-%d') if value else ''
+
+
+class Export:
+    """
+    One exportable dataset: a header and the rows of a values_list() read in
+    primary-key order with a server-side iterator, so memory stays flat and
+    an interrupted export can continue after the last written id.
+    """
+
+    def __init__(self, name, header, fields, queryset, filters=None, format_row=None):
+        self.name = name
+        self.header = header
+        self.fields = fields
+        self._queryset = queryset
+        self._filters = filters
+        self._format_row = format_row
+
+    def queryset(self, params=None):
+        queryset = self._queryset()
+        if self._filters and params:
+            queryset = queryset.filter(**self._filters(params))
+        return queryset
+
+    def rows(self, params=None, after=None, chunk_size=EXPORT_CHUNK_SIZE):
+        """Formatted rows (primary key first) ordered by primary key, optionally after a given key"""
+        queryset = self.queryset(params)
+        if after is not None:
+            queryset = queryset.filter(pk__gt=after)
+        rows = queryset.order_by('pk').values_list(*self.fields).iterator(chunk_size=chunk_size)
+        if self._format_row is None:
+            return rows
+        return map(self._format_row, rows)
+
+    def count(self, params=None):
+        return self.queryset(params).count()
+
+
+EXPORTS = {
+    export.name: export for export in [
+        Export(
+            'users',
+            ['ID', 'Username', 'Email', 'User Type', 'Date Joined', 'Is Active'],
+            ('id', 'username', 'email', 'user_type', 'date_joined', 'is_active'),
+            User.objects.all,
+        ),
+        Export(
+            'jobs',
+            ['ID', 'Title', 'Company', 'Category', 'Status', 'Created Date', 'Applications Count'],
+            ('id', 'title', 'company__company_name', 'category__name', 'status', 'created_at', 'applications_count'),
+            Job.objects.all,
+            format_row=lambda row: (*row[:3], row[3] or 'N/A', row[4], _date(row[5]), row[6]),
+        ),
+        Export(
+            'applications',
+            ['ID', 'Job ID', 'Job Title', 'Company', 'Applicant Email', 'Status', 'Applied Date', 'Match Score'],
+            ('id', 'job_id', 'job__title', 'job__company__company_name', 'applicant__user__email',
+             'status', 'applied_date', 'match_score'),
+            JobApplication.objects.all,
+            filters=application_filters,
+            format_row=lambda row: (*row[:6], _date(row[6]), '' if row[7] is None else round(row[7], 1)),
+        ),
+    ]
+}
+
+
+def csv_chunks(export, params=None):
+    """The export as CSV text, in chunks of about STREAM_BUFFER_SIZE"""
+    writer = csv.writer(Echo())
+    buffer = [writer.writerow(export.header)]
+    size = len(buffer[0])
+    for row in export.rows(params):
+        line = writer.writerow(row)
+        buffer.append(line)
+        size += len(line)
+        if size >= STREAM_BUFFER_SIZE:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def gzip_chunks(chunks):
+    """Compress a stream of text chunks into one gzip member as it goes"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def streaming_response(request, name):
+    """
+    Stream an export as a CSV download; ?gzip=1 compresses it on the fly.
+    Other query parameters are passed to the dataset's filters.
+    """
+    export = EXPORTS[name]
+    chunks = csv_chunks(export, request.GET)
+    filename = f'{name}_export.csv'
+    if request.GET.get('gzip') == '1':
+        response = StreamingHttpResponse(gzip_chunks(chunks), content_type='application/gzip')
+        filename += '.gz'
+    else:
+        response = StreamingHttpResponse(chunks, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _csv_line(writer):
+    return lambda row: writer.writerow(row)
+
+
+def _ndjson_line(export):
+    return lambda row: json.dumps(dict(zip(export.fields, row)), default=str) + '\n'
+
+
+def claim_export_job():
+    """
+    Take the oldest pending export, or a running one whose worker stopped
+    checkpointing. The claim is a compare-and-set on status and heartbeat, so
+    concurrent workers never run the same job. Returns the job or None.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=EXPORT_STALE_SECONDS)
+    candidates = ExportJob.objects.filter(
+        Q(status='pending') | Q(status='running', heartbeat_at__lt=stale)
+    ).order_by('created_at')
+    for job in candidates[:10]:
+        claimed = ExportJob.objects.filter(
+            pk=job.pk, status=job.status, heartbeat_at=job.heartbeat_at
+        ).update(status='running', heartbeat_at=now)
+        if claimed:
+            job.status, job.heartbeat_at = 'running', now
+            return job
+    return None
+
+
+def _checkpoint(job, **fields):
+    """Record progress; False if the job was taken over or removed meanwhile"""
+    fields['heartbeat_at'] = timezone.now()
+    if not ExportJob.objects.filter(pk=job.pk, status='running', heartbeat_at=job.heartbeat_at).update(**fields):
+        return False
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return True
+
+
+def run_export_job(job, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Write a claimed export to private storage in chunks of `chunk_size` rows.
+
+    After each chunk the file is flushed to disk and the rows written, the
+    file size and the last primary key are checkpointed on the job. A job
+    resumed after a crash truncates the file to the checkpointed size (dropping
+    a partly written chunk) and continues after the checkpointed key, so every
+    row is written exactly once. Returns the job's final status, or None if
+    another worker took the job over.
+    """
+    export = EXPORTS[job.dataset]
+    params = job.params or {}
+    # A resumed job keeps its file; new files get an unguessable name
+    name = job.file.name or f'{EXPORT_DIR}/{secrets.token_urlsafe(16)}_{job.dataset}.{job.format}'
+    path = job.file.storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    try:
+        if job.last_pk is None:
+            # Nothing checkpointed yet: (re)start; the count is an estimate as rows may change meanwhile
+            if not _checkpoint(job, started_at=job.started_at or timezone.now(), rows_done=0,
+                               total_estimate=export.count(params), bytes_written=0, file=name):
+                return None
+        if job.format == 'csv':
+            line = _csv_line(csv.writer(Echo()))
+        else:
+            line = _ndjson_line(export)
+
+        with open(path, 'r+b' if os.path.exists(path) else 'w+b') as out:
+            out.truncate(job.bytes_written)
+            out.seek(job.bytes_written)
+            if job.bytes_written == 0 and job.format == 'csv':
+                out.write(line(export.header).encode())
+
+            def flush(lines, last_pk):
+                out.write(''.join(lines).encode())
+                out.flush()
+                os.fsync(out.fileno())
+                return _checkpoint(job, rows_done=job.rows_done + len(lines), last_pk=last_pk, bytes_written=out.tell())
+
+            lines, last_pk = [], job.last_pk
+            for row in export.rows(params, after=job.last_pk, chunk_size=chunk_size):
+                lines.append(line(row))
+                last_pk = row[0]
+                if len(lines) >= chunk_size:
+                    if not flush(lines, last_pk):
+                        return None
+                    lines = []
+            if (lines or job.bytes_written < out.tell()) and not flush(lines, last_pk):
+                return None
+
+        _checkpoint(job, status='done', finished_at=timezone.now())
+    except Exception as exc:
+        _checkpoint(job, status='failed', error=str(exc), finished_at=timezone.now())
+    return job.status
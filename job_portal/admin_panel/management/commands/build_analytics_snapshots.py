@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from admin_panel import snapshots
+
+class Command(BaseCommand):
+    help = 'Refresh the admin analytics snapshots from rows changed since the last run (schedule nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Recompute every snapshot instead of only the changed keys')
+
+    def handle(self, *args, **options):
+        categories, companies, days = snapshots.build(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed {categories} categories, {companies} companies and {days} days.'
+        ))
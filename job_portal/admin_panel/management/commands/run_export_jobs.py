@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_panel import exports
+
+class Command(BaseCommand):
+    help = 'Run queued background exports, resuming any whose worker stopped (run under a process supervisor)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Exit when no export is waiting instead of polling for new ones')
+        parser.add_argument('--poll', type=float, default=5,
+                            help='Seconds between checks for new exports (default 5)')
+        parser.add_argument('--chunk-size', type=int, default=exports.EXPORT_CHUNK_SIZE,
+                            help='Rows written between checkpoints')
+
+    def handle(self, *args, **options):
+        while True:
+            job = exports.claim_export_job()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll'])
+                continue
+
+            status = exports.run_export_job(job, chunk_size=options['chunk_size'])
+            if status == 'done':
+                self.stdout.write(self.style.SUCCESS(f'{job}: {job.rows_done} rows written to {job.file.name}'))
+            elif status == 'failed':
+                self.stderr.write(f'{job}: {job.error}')
+            else:
+                self.stdout.write(f'{job}: taken over by another worker')
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0003_export_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dataset', 'deleted_at'], name='tombstone_dataset_deleted_idx')],
+            },
+        ),
+    ]
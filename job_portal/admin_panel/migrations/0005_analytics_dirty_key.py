@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0004_export_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsDirtyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('day', 'Day'), ('category', 'Category'), ('company', 'Company'), ('site', 'Site')], max_length=20)),
+                ('key', models.CharField(max_length=50)),
+                ('marked_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('scope', 'key')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:36
+
+import admin_panel.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0005_analytics_dirty_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='file',
+            field=models.FileField(blank=True, storage=admin_panel.models.private_storage, upload_to='exports/'),
+        ),
+    ]
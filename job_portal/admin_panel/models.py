@@ -1,5 +1,8 @@
 # admin_panel/models.py
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
+from django.utils.functional import cached_property
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -93,3 +96,134 @@ class EmployerProfile(models.Model):
 
     def __str__(self):
         return f"{self.company_name} - {self.user.username}"
+
+class AnalyticsSnapshot(models.Model):
+    """Precomputed admin analytics, one row per (scope, key); filled by build_analytics_snapshots"""
+    
+    SCOPE_CHOICES = [
+        ('day', 'Day'),            # key: ISO date of application day
+        ('category', 'Category'),  # key: JobCategory id
+        ('company', 'Company'),    # key: EmployerProfile id
+        ('site', 'Site'),          # key: 'all'
+    ]
+    
+    scope = models.CharField(max_length=20, choices=SCOPE_CHOICES)
+    key = models.CharField(max_length=50)
+    metrics = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['scope', 'key']
+    
+    def __str__(self):
+        return f"{self.scope}:{self.key}"
+
+class AnalyticsWatermark(models.Model):
+    """Change timestamp a consumer of changed rows (analytics snapshots, delta export feeds) is current to"""
+    
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.name} @ {self.watermark:%Y-%m-%d %H:%M}"
+
+class AnalyticsDirtyKey(models.Model):
+    """A snapshot key to recompute on the next incremental build, for changes no timestamp shows (deletions, moves)"""
+    
+    scope = models.CharField(max_length=20, choices=AnalyticsSnapshot.SCOPE_CHOICES)
+    key = models.CharField(max_length=50)
+    marked_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['scope', 'key']
+    
+    def __str__(self):
+        return f"{self.scope}:{self.key} marked {self.marked_at:%Y-%m-%d %H:%M}"
+
+class ExportTombstone(models.Model):
+    """A deleted row, reported by the delta export feed until it is pruned"""
+    
+    dataset = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['dataset', 'deleted_at'], name='tombstone_dataset_deleted_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.dataset}:{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+class PrivateStorage(FileSystemStorage):
+    """File system storage under PRIVATE_MEDIA_ROOT, for files that must not be reachable under MEDIA_URL"""
+    
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.PRIVATE_MEDIA_ROOT)
+    
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'PRIVATE_MEDIA_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+def private_storage():
+    return PrivateStorage()
+
+class ExportJob(models.Model):
+    """A background data export, written to PRIVATE_MEDIA_ROOT by the run_export_jobs worker"""
+    
+    DATASET_CHOICES = [
+        ('users', 'Users'),
+        ('jobs', 'Jobs'),
+        ('applications', 'Applications'),
+    ]
+    
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    dataset = models.CharField(max_length=20, choices=DATASET_CHOICES)
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default='csv')
+    params = models.JSONField(default=dict, blank=True, help_text="Dataset filters, e.g. applications status/start/end")
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='export_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    
+    # Progress and resume point: rows and bytes durably written, and the last exported primary key
+    rows_done = models.PositiveIntegerField(default=0)
+    total_estimate = models.PositiveIntegerField(default=0)
+    last_pk = models.BigIntegerField(null=True, blank=True)
+    bytes_written = models.BigIntegerField(default=0)
+    
+    file = models.FileField(upload_to='exports/', storage=private_storage, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='exportjob_queue_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_dataset_display()} export #{self.pk} ({self.status})"
+    
+    @property
+    def percent(self):
+        if self.status == 'done':
+            return 100
+        if not self.total_estimate:
+            return 0
+        return min(99, int(self.rows_done * 100 / self.total_estimate))
@@ -0,0 +1,57 @@
+# admin_panel/signals.py - Record deletions for the delta export feed and the analytics snapshots
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import EmployerProfile, JobSeekerProfile
+from jobs.models import Job, JobApplication, JobCategory
+from . import delta, snapshots
+
+@receiver(post_delete, sender=Job)
+@receiver(post_delete, sender=JobApplication)
+@receiver(post_delete, sender=JobSeekerProfile)
+@receiver(post_delete, sender=EmployerProfile)
+def record_tombstone(sender, instance, **kwargs):
+    delta.record_deletion(sender, instance.pk)
+
+@receiver(post_delete, sender=JobApplication)
+def mark_snapshots_on_application_delete(sender, instance, origin=None, **kwargs):
+    """Applications deleted directly; cascades are marked in bulk by the pre_delete receivers below"""
+    if not (isinstance(origin, JobApplication) or (isinstance(origin, QuerySet) and origin.model is JobApplication)):
+        return
+    job = Job.objects.filter(pk=instance.job_id).values('category_id', 'company_id').first() or {}
+    snapshots.mark_dirty(
+        categories=[job.get('category_id')], companies=[job.get('company_id')],
+        days=[timezone.localdate(instance.applied_date)],
+    )
+
+@receiver(pre_delete, sender=Job)
+def mark_snapshots_on_job_delete(sender, instance, **kwargs):
+    snapshots.mark_dirty(categories=[instance.category_id], companies=[instance.company_id])
+    snapshots.mark_applications_dirty(instance.applications.all())
+
+@receiver(pre_delete, sender=JobSeekerProfile)
+def mark_snapshots_on_applicant_delete(sender, instance, **kwargs):
+    snapshots.mark_applications_dirty(instance.applications.all())
+
+@receiver(post_save, sender=Job)
+def mark_snapshots_on_job_move(sender, instance, created, **kwargs):
+    """The category/company a job left no longer counts it, though only the job's row changed"""
+    if created:
+        return
+    old_category, old_company = instance.get_loaded_value('category_id'), instance.get_loaded_value('company_id')
+    if old_category != instance.category_id or old_company != instance.company_id:
+        snapshots.mark_dirty(
+            categories=[old_category] if old_category != instance.category_id else [],
+            companies=[old_company] if old_company != instance.company_id else [],
+        )
+
+@receiver(post_delete, sender=JobCategory)
+def mark_snapshots_on_category_delete(sender, instance, **kwargs):
+    snapshots.mark_dirty(categories=[instance.pk])
+
+@receiver(post_delete, sender=EmployerProfile)
+def mark_snapshots_on_company_delete(sender, instance, **kwargs):
+    snapshots.mark_dirty(companies=[instance.pk])
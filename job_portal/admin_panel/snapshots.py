@@ -0,0 +1,242 @@
+# admin_panel/snapshots.py - Incremental materialization of admin analytics into AnalyticsSnapshot
+
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, IntegerField, Q, Sum
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, TruncDate
+from django.utils import timezone
+
+from accounts.models import EmployerProfile
+from jobs.models import Job, JobApplication, JobCategory
+from .models import AnalyticsDirtyKey, AnalyticsSnapshot, AnalyticsWatermark
+
+WATERMARK = 'analytics'
+
+STATUSES = [status for status, _ in JobApplication.STATUS_CHOICES]
+
+
+def _day_range(day, tz):
+    start = timezone.make_aware(datetime.combine(day, time.min), tz)
+    return start, start + timedelta(days=1)
+
+
+def changed_keys(since):
+    """Categories, companies and application days touched by rows changed at or after `since`"""
+    jobs = Job.objects.filter(updated_at__gte=since)
+    applications = JobApplication.objects.filter(updated_date__gte=since)
+    tz = timezone.get_current_timezone()
+
+    categories = set(jobs.values_list('category_id', flat=True))
+    categories |= set(applications.values_list('job__category_id', flat=True))
+    companies = set(jobs.values_list('company_id', flat=True))
+    companies |= set(applications.values_list('job__company_id', flat=True))
+    companies |= set(EmployerProfile.objects.filter(updated_at__gte=since).values_list('pk', flat=True))
+    days = set(
+        applications.annotate(day=TruncDate('applied_date', tzinfo=tz)).values_list('day', flat=True)
+    )
+    categories.discard(None)
+    return categories, companies, days
+
+
+def mark_dirty(categories=(), companies=(), days=()):
+    """Queue keys for the next incremental build, for changes updated_at can't show (deletions, moves)"""
+    keys = [('category', key) for key in categories if key is not None]
+    keys += [('company', key) for key in companies if key is not None]
+    keys += [('day', key.isoformat()) for key in days]
+    # Re-marking a key moves its marked_at forward, so a build already running doesn't consume it
+    AnalyticsDirtyKey.objects.bulk_create(
+        [AnalyticsDirtyKey(scope=scope, key=str(key)) for scope, key in keys],
+        update_conflicts=True, unique_fields=['scope', 'key'], update_fields=['marked_at'],
+    )
+
+
+def mark_applications_dirty(applications):
+    """Queue the keys an application queryset contributes to, with one query (for cascade deletes)"""
+    tz = timezone.get_current_timezone()
+    rows = applications.annotate(day=TruncDate('applied_date', tzinfo=tz)).values_list(
+        'job__category_id', 'job__company_id', 'day'
+    ).distinct().order_by()
+    categories, companies, days = set(), set(), set()
+    for category_id, company_id, day in rows:
+        categories.add(category_id)
+        companies.add(company_id)
+        days.add(day)
+    mark_dirty(categories, companies, days)
+
+
+def dirty_keys():
+    categories, companies, days = set(), set(), set()
+    for scope, key in AnalyticsDirtyKey.objects.values_list('scope', 'key'):
+        if scope == 'category':
+            categories.add(int(key))
+        elif scope == 'company':
+            companies.add(int(key))
+        elif scope == 'day':
+            days.add(date.fromisoformat(key))
+    return categories, companies, days
+
+
+def all_keys():
+    tz = timezone.get_current_timezone()
+    days = JobApplication.objects.annotate(day=TruncDate('applied_date', tzinfo=tz)).values_list('day', flat=True)
+    return (
+        set(JobCategory.objects.values_list('pk', flat=True)),
+        set(EmployerProfile.objects.values_list('pk', flat=True)),
+        set(days.distinct().order_by()),
+    )
+
+
+def _job_totals(group_by, ids):
+    """Per-group job counts and applications (from the maintained Job.applications_count)"""
+    return {
+        row[group_by]: row
+        for row in Job.objects.filter(**{f'{group_by}__in': ids}).values(group_by).annotate(
+            total_jobs=Count('pk'),
+            active_jobs=Count('pk', filter=Q(status='active')),
+            total_applications=Sum('applications_count'),
+        ).order_by()
+    }
+
+
+def category_metrics(ids):
+    totals = _job_totals('category', ids)
+    return {
+        category_id: {
+            'name': name,
+            'total_jobs': totals.get(category_id, {}).get('total_jobs', 0),
+            'active_jobs': totals.get(category_id, {}).get('active_jobs', 0),
+            'total_applications': totals.get(category_id, {}).get('total_applications') or 0,
+        }
+        for category_id, name in JobCategory.objects.filter(pk__in=ids).values_list('pk', 'name')
+    }
+
+
+def company_metrics(ids):
+    totals = _job_totals('company', ids)
+    metrics = {}
+    for company_id, name, website in EmployerProfile.objects.filter(pk__in=ids).values_list(
+        'pk', 'company_name', 'website'
+    ):
+        row = totals.get(company_id, {})
+        total_jobs = row.get('total_jobs', 0)
+        total_applications = row.get('total_applications') or 0
+        metrics[company_id] = {
+            'company_name': name,
+            'website': website,
+            'total_jobs': total_jobs,
+            'active_jobs': row.get('active_jobs', 0),
+            'total_applications': total_applications,
+            'avg_applications_per_job': round(total_applications / total_jobs, 2) if total_jobs else 0,
+        }
+    return metrics
+
+
+def day_metrics(days):
+    """Applications per status for each local day in `days`"""
+    tz = timezone.get_current_timezone()
+    metrics = {day: dict.fromkeys(STATUSES, 0) for day in days}
+    if days:
+        # One indexed range scan from the first to the last day; days in between are skipped below
+        start, _ = _day_range(min(days), tz)
+        _, end = _day_range(max(days), tz)
+        rows = JobApplication.objects.filter(applied_date__gte=start, applied_date__lt=end).annotate(
+            day=TruncDate('applied_date', tzinfo=tz)
+        ).values('day', 'status').annotate(count=Count('pk')).order_by()
+        for row in rows:
+            if row['day'] in metrics:
+                metrics[row['day']][row['status']] = row['count']
+    for counts in metrics.values():
+        counts['total'] = sum(counts[status] for status in STATUSES)
+    return metrics
+
+
+def _store(scope, metrics, keys=(), full=False):
+    """Upsert the metrics; drop rows of requested `keys` that no longer exist (every other row if `full`)"""
+    rows = [AnalyticsSnapshot(scope=scope, key=str(key), metrics=value) for key, value in metrics.items()]
+    AnalyticsSnapshot.objects.bulk_create(
+        rows, batch_size=500, update_conflicts=True,
+        unique_fields=['scope', 'key'], update_fields=['metrics', 'updated_at'],
+    )
+    if full:
+        AnalyticsSnapshot.objects.filter(scope=scope).exclude(key__in=[row.key for row in rows]).delete()
+    else:
+        gone = [str(key) for key in keys if key not in metrics]
+        AnalyticsSnapshot.objects.filter(scope=scope, key__in=gone).delete()
+
+
+def build(full=False):
+    """
+    Bring the snapshots up to date; returns (categories, companies, days) refreshed.
+
+    Only keys touched since the stored watermark are recomputed, each from an
+    exact grouped query, so reruns are idempotent. The new watermark is the
+    start time of the run, so rows changed during it are picked up next time.
+    Deletions and moved jobs leave no timestamp behind; their keys are queued
+    by admin_panel.signals in AnalyticsDirtyKey and consumed here. A full build
+    (also the first one) recomputes every key.
+    """
+    started = timezone.now()
+    mark = AnalyticsWatermark.objects.filter(name=WATERMARK).first()
+    full = full or mark is None
+    if full:
+        categories, companies, days = all_keys()
+    else:
+        categories, companies, days = changed_keys(mark.watermark)
+        dirty_categories, dirty_companies, dirty_days = dirty_keys()
+        categories |= dirty_categories
+        companies |= dirty_companies
+        days |= dirty_days
+
+    with transaction.atomic():
+        _store('category', category_metrics(categories), categories, full)
+        _store('company', company_metrics(companies), companies, full)
+        _store('day', day_metrics(days), days, full)
+
+        # Site-wide status totals, summed from the (small) day rows
+        totals = dict.fromkeys(STATUSES + ['total'], 0)
+        for metrics in AnalyticsSnapshot.objects.filter(scope='day').values_list('metrics', flat=True):
+            for status, count in metrics.items():
+                totals[status] = totals.get(status, 0) + count
+        _store('site', {'all': totals})
+
+        AnalyticsWatermark.objects.update_or_create(name=WATERMARK, defaults={'watermark': started})
+        # Keys marked since the run started may have been read before their change; keep them
+        AnalyticsDirtyKey.objects.filter(marked_at__lt=started).delete()
+    return len(categories), len(companies), len(days)
+
+
+def _ensure_built():
+    if not AnalyticsWatermark.objects.filter(name=WATERMARK).exists():
+        build(full=True)
+
+
+def status_distribution():
+    """Applications per status as [{'status': ..., 'count': ...}], from the snapshot"""
+    _ensure_built()
+    row = AnalyticsSnapshot.objects.filter(scope='site', key='all').first()
+    totals = row.metrics if row else {}
+    return [{'status': status, 'count': totals.get(status, 0)} for status in STATUSES if totals.get(status)]
+
+
+def success_rate():
+    """Percentage of applications accepted"""
+    counts = {row['status']: row['count'] for row in status_distribution()}
+    total = sum(counts.values())
+    return round(counts.get('accepted', 0) / total * 100, 2) if total else 0
+
+
+def _ranked(scope, metric):
+    _ensure_built()
+    return AnalyticsSnapshot.objects.filter(scope=scope).order_by(
+        Cast(KT(f'metrics__{metric}'), IntegerField()).desc()
+    ).values_list('metrics', flat=True)
+
+
+def category_stats():
+    return list(_ranked('category', 'total_jobs'))
+
+
+def company_stats(limit=10):
+    return list(_ranked('company', 'total_applications')[:limit])
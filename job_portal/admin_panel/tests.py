@@ -1,3 +1,127 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from datetime import timedelta
 
-# Create your tests here.
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User
+from jobs.models import Job, JobApplication, JobCategory
+from . import delta, exports, snapshots, views
+from .models import AnalyticsDirtyKey, AnalyticsSnapshot, ExportJob
+
+
+class AnalyticsSnapshotTests(TestCase):
+    def test_incremental_build_sees_deleted_applications_and_moved_jobs(self):
+        employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='x', user_type='employer'
+        )
+        seeker = User.objects.create_user(
+            username='seeker', email='seeker@example.com', password='x', user_type='job_seeker'
+        )
+        design, writing = JobCategory.objects.create(name='Design'), JobCategory.objects.create(name='Writing')
+        job = Job.objects.create(
+            company=employer.employer_profile, category=design, title='Designer', description='d',
+            requirements='r', responsibilities='r', location='Remote', status='active',
+        )
+        application = JobApplication.objects.create(job=job, applicant=seeker.job_seeker_profile)
+        snapshots.build(full=True)
+
+        def metrics(scope, key):
+            return AnalyticsSnapshot.objects.get(scope=scope, key=str(key)).metrics
+
+        self.assertEqual(metrics('site', 'all')['total'], 1)
+
+        application.delete()
+        job = Job.objects.get(pk=job.pk)
+        job.category = writing
+        job.save()
+        snapshots.build()
+
+        self.assertEqual(metrics('site', 'all')['total'], 0)
+        self.assertEqual(metrics('category', design.pk)['total_jobs'], 0)
+        self.assertEqual(metrics('category', writing.pk)['total_jobs'], 1)
+        self.assertEqual(metrics('company', employer.employer_profile.pk)['total_applications'], 0)
+        self.assertFalse(AnalyticsDirtyKey.objects.exists())
+
+        design.delete()
+        snapshots.build()
+        self.assertFalse(AnalyticsSnapshot.objects.filter(scope='category', key=str(design.pk)).exists())
+
+
+    def test_cascade_delete_marks_keys_once(self):
+        employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='x', user_type='employer'
+        )
+        job = Job.objects.create(
+            company=employer.employer_profile, title='Designer', description='d',
+            requirements='r', responsibilities='r', location='Remote', status='active',
+        )
+        for i in range(3):
+            seeker = User.objects.create_user(
+                username=f'seeker{i}', email=f'seeker{i}@example.com', password='x', user_type='job_seeker'
+            )
+            JobApplication.objects.create(job=job, applicant=seeker.job_seeker_profile)
+        snapshots.build(full=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            job.delete()
+        marks = [query for query in queries if 'analyticsdirtykey' in query['sql'].lower()]
+        self.assertEqual(len(marks), 2)
+        snapshots.build()
+        self.assertEqual(AnalyticsSnapshot.objects.get(scope='site', key='all').metrics['total'], 0)
+
+
+class ExportJobTests(TestCase):
+    def test_export_is_written_to_private_storage_under_a_random_name(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(PRIVATE_MEDIA_ROOT=root):
+            jobs = [ExportJob.objects.create(dataset='users') for _ in range(2)]
+            for job in jobs:
+                self.assertEqual(exports.run_export_job(exports.claim_export_job()), 'done')
+                job.refresh_from_db()
+                self.assertTrue(os.path.isfile(os.path.join(root, job.file.name)))
+                self.assertFalse(job.file.name.startswith(f'exports/{job.pk}_'))
+                self.assertFalse(job.file.path.startswith(str(settings.MEDIA_ROOT)))
+            self.assertNotEqual(jobs[0].file.name, jobs[1].file.name)
+
+    @override_settings(ROOT_URLCONF='jobs.tests')
+    def test_settings_form_filters_reach_application_exports(self):
+        admin = User.objects.create_user(username='root', email='root@example.com', password='x', user_type='admin')
+        self.client.force_login(admin)
+        self.assertContains(self.client.get(reverse('admin_panel:system_settings')), 'name="company"')
+        filters = {'start': '2030-01-01', 'end': '2030-01-31', 'status': 'accepted', 'company': '3'}
+        for dataset in ('applications', 'users'):
+            self.client.post(reverse('admin_panel:request_export'), {'dataset': dataset, 'format': 'csv', **filters})
+        self.assertEqual(ExportJob.objects.get(dataset='applications').params, filters)
+        self.assertEqual(ExportJob.objects.get(dataset='users').params, {})
+
+
+class DeltaFeedTests(TestCase):
+    def test_rows_leave_out_columns_written_without_a_timestamp(self):
+        employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='x', user_type='employer'
+        )
+        Job.objects.create(
+            company=employer.employer_profile, title='Designer', description='d',
+            requirements='r', responsibilities='r', location='Remote', status='active',
+        )
+        records = list(delta.changes(None, delta.next_watermark() + timedelta(minutes=5)))
+        rows = {record['dataset']: record['row'] for record in records}
+        self.assertEqual(set(rows), {'jobs', 'employer_profiles'})
+        for row in rows.values():
+            self.assertFalse(delta.DERIVED_FIELDS & set(row))
+        self.assertEqual(rows['jobs']['title'], 'Designer')
+
+
+class QuickStatsTests(TestCase):
+    def test_counts_come_from_one_standalone_query(self):
+        User.objects.create_user(username='seeker', email='seeker@example.com', password='x', user_type='job_seeker')
+        with self.assertNumQueries(1):
+            stats = json.loads(views.compute_quick_stats()['body'])
+        self.assertEqual(stats, {
+            'users_today': 1, 'jobs_today': 0, 'applications_today': 0, 'pending_applications': 0,
+        })
@@ -28,6 +28,11 @@ urlpatterns = [
     # Export Functions
     path('export/users/', views.export_users, name='export_users'),
     path('export/jobs/', views.export_jobs, name='export_jobs'),
+    path('export/applications/', views.export_applications, name='export_applications'),
+    path('export/background/', views.request_export, name='request_export'),
+    path('export/background/<int:pk>/', views.export_job_status, name='export_job_status'),
+    path('export/background/<int:pk>/download/', views.export_job_download, name='export_job_download'),
+    path('export/delta/', views.delta_export, name='delta_export'),
     
     # API Endpoints
     path('api/quick-stats/', views.quick_stats_api, name='quick_stats_api'),
@@ -7,20 +7,50 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Count, Sum, Avg
-from django.http import JsonResponse, HttpResponse
+from django.db import connection
+from django.db.models import Q, Count, Sum, F, Func
+from django.core.cache import cache
+from django.http import FileResponse, Http404, JsonResponse, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.urls import reverse
 from django.views.decorators.http import require_POST
 from datetime import datetime, timedelta
+import hashlib
 import json
-import csv
+import time
 
-from accounts.models import User, JobSeekerProfile, EmployerProfile
+from accounts.models import User, JobSeekerProfile, EmployerProfile, UserSearchTerm
 from jobs.models import Job, JobApplication, SavedJob, JobCategory
+from jobs.pagination import CursorPaginator
+from jobs.search import search_jobs
+from jobs.stats import daily_series
+from . import delta, exports, snapshots
+from .models import ExportJob
+from .timeseries import bucketed, running_total
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Longest range the dashboards accept for ?days=
+MAX_DAYS = 365
+
+# How long computed analytics series are reused
+ANALYTICS_CACHE_SECONDS = 600
+
+def days_param(request, default=30):
+    """The ?days= range, defaulting when missing or invalid and capped at MAX_DAYS"""
+    try:
+        days = int(request.GET.get('days', default))
+    except (TypeError, ValueError):
+        return default
+    return min(max(days, 1), MAX_DAYS)
+
+def cached_series(name, days, compute):
+    """Cache a series per (range, local day) so reloads and widgets share one computation"""
+    key = f'admin-analytics:{name}:{days}:{timezone.localdate().isoformat()}'
+    return cache.get_or_set(key, compute, ANALYTICS_CACHE_SECONDS)
+
 # Helper function to check if user is admin
 def is_admin(user):
     return user.is_authenticated and (user.is_superuser or user.user_type == 'admin')
@@ -35,80 +65,61 @@ def admin_dashboard(request):
     """Main admin dashboard with comprehensive statistics"""
     
     # Time range filter
-    days = int(request.GET.get('days', 30))
+    days = days_param(request)
     start_date = timezone.now() - timedelta(days=days)
     
-    # User Statistics
-    total_users = User.objects.count()
-    job_seekers = User.objects.filter(user_type='job_seeker').count()
-    employers = User.objects.filter(user_type='employer').count()
-    new_users_this_period = User.objects.filter(date_joined__gte=start_date).count()
-    
-    # Job Statistics
-    total_jobs = Job.objects.count()
-    active_jobs = Job.objects.filter(status='active').count()
-    jobs_this_period = Job.objects.filter(created_at__gte=start_date).count()
-    
-    # Application Statistics
-    total_applications = JobApplication.objects.count()
-    applications_this_period = JobApplication.objects.filter(applied_date__gte=start_date).count()
+    # User, job and application totals (one aggregate query each)
+    user_totals = User.objects.aggregate(
+        total=Count('pk'),
+        job_seekers=Count('pk', filter=Q(user_type='job_seeker')),
+        employers=Count('pk', filter=Q(user_type='employer')),
+        this_period=Count('pk', filter=Q(date_joined__gte=start_date)),
+    )
+    job_totals = Job.objects.aggregate(
+        total=Count('pk'),
+        active=Count('pk', filter=Q(status='active')),
+        this_period=Count('pk', filter=Q(created_at__gte=start_date)),
+    )
+    application_totals = JobApplication.objects.aggregate(
+        total=Count('pk'),
+        this_period=Count('pk', filter=Q(applied_date__gte=start_date)),
+    )
     
-    # Application Status Distribution
-    application_status_data = JobApplication.objects.values('status').annotate(
-        count=Count('id')
-    ).order_by('status')
+    # Application Status Distribution (nightly snapshot)
+    application_status_data = snapshots.status_distribution()
     
     # Top Categories
     top_categories = JobCategory.objects.annotate(
-        job_count=Count('job', filter=Q(job__status='active'))
-    ).order_by('-job_count')[:5]
+        job_count=F('active_jobs_count')
+    ).order_by('-active_jobs_count')[:5]
     
     # Recent Activity
     recent_users = User.objects.order_by('-date_joined')[:5]
-    recent_jobs = Job.objects.order_by('-created_at')[:5]
+    recent_jobs = Job.objects.select_related('company').order_by('-created_at')[:5]
     recent_applications = JobApplication.objects.select_related(
         'job', 'applicant', 'applicant__user'
     ).order_by('-applied_date')[:10]
     
-    # Chart Data for Analytics
-    # Daily registrations for the last 30 days
-    daily_registrations = []
-    for i in range(30):
-        day = timezone.now() - timedelta(days=i)
-        count = User.objects.filter(
-            date_joined__date=day.date()
-        ).count()
-        daily_registrations.append({
-            'date': day.strftime('%Y-%m-%d'),
-            'count': count
-        })
-    daily_registrations.reverse()
-    
-    # Monthly job postings
-    monthly_jobs = []
-    for i in range(12):
-        month_start = timezone.now().replace(day=1) - timedelta(days=30*i)
-        month_end = month_start.replace(day=28) + timedelta(days=4)
-        count = Job.objects.filter(
-            created_at__gte=month_start,
-            created_at__lt=month_end
-        ).count()
-        monthly_jobs.append({
-            'month': month_start.strftime('%Y-%m'),
-            'count': count
-        })
-    monthly_jobs.reverse()
+    # Chart Data for Analytics (one GROUP BY each, gap-filled)
+    daily_registrations = [
+        {'date': point['start'].strftime('%Y-%m-%d'), 'count': point['count']}
+        for point in bucketed(User.objects.all(), 'date_joined', 'day', 30)
+    ]
+    monthly_jobs = [
+        {'month': point['start'].strftime('%Y-%m'), 'count': point['count']}
+        for point in bucketed(Job.objects.all(), 'created_at', 'month', 12)
+    ]
     
     context = {
-        'total_users': total_users,
-        'job_seekers': job_seekers,
-        'employers': employers,
-        'new_users_this_period': new_users_this_period,
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'jobs_this_period': jobs_this_period,
-        'total_applications': total_applications,
-        'applications_this_period': applications_this_period,
+        'total_users': user_totals['total'],
+        'job_seekers': user_totals['job_seekers'],
+        'employers': user_totals['employers'],
+        'new_users_this_period': user_totals['this_period'],
+        'total_jobs': job_totals['total'],
+        'active_jobs': job_totals['active'],
+        'jobs_this_period': job_totals['this_period'],
+        'total_applications': application_totals['total'],
+        'applications_this_period': application_totals['this_period'],
         'application_status_data': list(application_status_data),
         'top_categories': top_categories,
         'recent_users': recent_users,
@@ -132,28 +143,24 @@ def user_management(request):
     search = request.GET.get('search', '')
     status = request.GET.get('status', '')
     
-    users = User.objects.all().order_by('-date_joined')
+    users = User.objects.all()
     
     if user_type:
         users = users.filter(user_type=user_type)
     
-    if search:
-        users = users.filter(
-            Q(username__icontains=search) |
-            Q(email__icontains=search) |
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search)
-        )
+    if search.strip():
+        # Prefix match on username, email, first/last/full name via the indexed search terms
+        users = users.filter(pk__in=UserSearchTerm.objects.user_ids(search))
     
+    # __in rather than =True/False, which SQLite compiles to a bare column test that can't seek the index
     if status == 'active':
-        users = users.filter(is_active=True)
+        users = users.filter(is_active__in=[True])
     elif status == 'inactive':
-        users = users.filter(is_active=False)
+        users = users.filter(is_active__in=[False])
     
-    # Pagination
-    paginator = Paginator(users, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination over the (user_type, is_active, date_joined) indexes
+    paginator = CursorPaginator(users, 20, ordering=('-date_joined', '-id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'page_obj': page_obj,
@@ -189,8 +196,8 @@ def user_detail(request, pk):
     elif user.user_type == 'employer' and profile:
         stats = {
             'posted_jobs': Job.objects.filter(company=profile).count(),
-            'active_jobs': Job.objects.filter(company=profile, status='active').count(),
-            'total_applications': JobApplication.objects.filter(job__company=profile).count(),
+            'active_jobs': profile.active_jobs_count,
+            'total_applications': profile.jobs.aggregate(total=Sum('applications_count'))['total'] or 0,
         }
     
     context = {
@@ -221,11 +228,7 @@ def job_management(request):
         jobs = jobs.filter(category_id=category)
     
     if search:
-        jobs = jobs.filter(
-            Q(title__icontains=search) |
-            Q(company__company_name__icontains=search) |
-            Q(description__icontains=search)
-        )
+        jobs = search_jobs(jobs, search)
     
     # Pagination
     paginator = Paginator(jobs, 20)
@@ -253,55 +256,25 @@ def analytics_dashboard(request):
     """Advanced analytics dashboard"""
     
     # Date range
-    days = int(request.GET.get('days', 30))
-    start_date = timezone.now() - timedelta(days=days)
+    days = days_param(request)
     
-    # User Growth Analytics
-    user_growth = []
-    for i in range(days):
-        day = timezone.now() - timedelta(days=i)
-        daily_users = User.objects.filter(date_joined__date=day.date()).count()
-        cumulative_users = User.objects.filter(date_joined__lte=day).count()
-        user_growth.append({
-            'date': day.strftime('%Y-%m-%d'),
-            'daily': daily_users,
-            'cumulative': cumulative_users
-        })
-    user_growth.reverse()
-    
-    # Job Application Success Rate
-    total_apps = JobApplication.objects.count()
-    successful_apps = JobApplication.objects.filter(status='accepted').count()
-    success_rate = (successful_apps / total_apps * 100) if total_apps > 0 else 0
-    
-    # Most Popular Job Categories
-    category_stats = JobCategory.objects.annotate(
-        total_jobs=Count('job'),
-        active_jobs=Count('job', filter=Q(job__status='active')),
-        total_applications=Count('job__applications')
-    ).order_by('-total_jobs')
-    
-    # Company Performance
-    company_stats = EmployerProfile.objects.annotate(
-        total_jobs=Count('jobs'),
-        total_applications=Count('jobs__applications'),
-        avg_applications_per_job=Avg('jobs__applications')
-    ).order_by('-total_applications')[:10]
-    
-    # Application Timeline
-    application_timeline = []
-    for i in range(30):
-        day = timezone.now() - timedelta(days=i)
-        daily_apps = JobApplication.objects.filter(applied_date__date=day.date()).count()
-        application_timeline.append({
-            'date': day.strftime('%Y-%m-%d'),
-            'applications': daily_apps
-        })
-    application_timeline.reverse()
+    # User Growth Analytics (one GROUP BY plus a running total)
+    user_growth = cached_series('user-growth', days, lambda: [
+        {'date': point['start'].strftime('%Y-%m-%d'), 'daily': point['count'], 'cumulative': point['cumulative']}
+        for point in running_total(User.objects.all(), 'date_joined', 'day', days)
+    ])
+    
+    # Success rate, category and company performance (precomputed by build_analytics_snapshots)
+    success_rate = snapshots.success_rate()
+    category_stats = snapshots.category_stats()
+    company_stats = snapshots.company_stats(limit=10)
+    
+    # Application Timeline (one GROUP BY over the JobDailyStats rollup)
+    application_timeline = cached_series('application-timeline', days, lambda: daily_series(days=days))
     
     context = {
         'user_growth': user_growth,
-        'success_rate': round(success_rate, 2),
+        'success_rate': success_rate,
         'category_stats': category_stats,
         'company_stats': company_stats,
         'application_timeline': application_timeline,
@@ -323,15 +296,19 @@ def system_settings(request):
     
     # Get system statistics
     system_stats = {
-        'total_users': User.objects.count(),
-        'total_jobs': Job.objects.count(),
-        'total_applications': JobApplication.objects.count(),
-        'database_size': 'N/A',  # You can implement this
-        'last_backup': 'N/A',    # You can implement this
+        'Total Users': User.objects.count(),
+        'Total Jobs': Job.objects.count(),
+        'Total Applications': JobApplication.objects.count(),
+        'Database Size': 'N/A',  # You can implement this
+        'Last Backup': 'N/A',    # You can implement this
     }
     
     context = {
         'system_stats': system_stats,
+        'export_jobs': ExportJob.objects.select_related('requested_by')[:10],
+        'export_datasets': ExportJob.DATASET_CHOICES,
+        'export_formats': ExportJob.FORMAT_CHOICES,
+        'export_statuses': JobApplication.STATUS_CHOICES,
     }
     
     return render(request, 'admin_panel/settings.html', context)
@@ -375,60 +352,170 @@ def update_job_status(request, pk):
 @login_required
 @user_passes_test(is_admin)
 def export_users(request):
-    """Export users to CSV"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="users_export.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['ID', 'Username', 'Email', 'User Type', 'Date Joined', 'Is Active'])
-    
-    users = User.objects.all().values_list(
-        'id', 'username', 'email', 'user_type', 'date_joined', 'is_active'
-    )
-    
-    for user in users:
-        writer.writerow(user)
-    
-    return response
+    """Export users to CSV (streamed)"""
+    return exports.streaming_response(request, 'users')
 
 @login_required
 @user_passes_test(is_staff_or_admin)
 def export_jobs(request):
-    """Export jobs to CSV"""
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="jobs_export.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow(['ID', 'Title', 'Company', 'Category', 'Status', 'Created Date', 'Applications Count'])
+    """Export jobs to CSV (streamed)"""
+    return exports.streaming_response(request, 'jobs')
+
+@login_required
+@user_passes_test(is_staff_or_admin)
+def export_applications(request):
+    """Export applications to CSV (streamed), filtered by ?start=&end=&status=&company="""
+    return exports.streaming_response(request, 'applications')
+
+# Background Exports (written by the run_export_jobs worker)
+@login_required
+@user_passes_test(is_admin)
+@require_POST
+def request_export(request):
+    """Queue a background export; applications take the same filters as the streamed export"""
+    dataset = request.POST.get('dataset')
+    export_format = request.POST.get('format', 'csv')
+    if dataset not in exports.EXPORTS or export_format not in dict(ExportJob.FORMAT_CHOICES):
+        messages.error(request, 'Invalid export.')
+        return redirect('admin_panel:system_settings')
     
-    jobs = Job.objects.select_related('company', 'category').annotate(
-        app_count=Count('applications')
+    # The filters only apply to applications
+    params = {}
+    if dataset == 'applications':
+        params = {
+            name: request.POST[name] for name in ('start', 'end', 'status', 'company')
+            if request.POST.get(name)
+        }
+    job = ExportJob.objects.create(
+        dataset=dataset, format=export_format, params=params, requested_by=request.user
     )
-    
-    for job in jobs:
-        writer.writerow([
-            job.id,
-            job.title,
-            job.company.company_name,
-            job.category.name if job.category else 'N/A',
-            job.status,
-            job.created_at.strftime('%Y-%m-%d'),
-            job.app_count
-        ])
-    
+    messages.success(request, f'{job.get_dataset_display()} export queued.')
+    return redirect('admin_panel:system_settings')
+
+def _export_job_json(job):
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'rows_done': job.rows_done,
+        'total_estimate': job.total_estimate,
+        'percent': job.percent,
+        'error': job.error,
+        'download_url': reverse('admin_panel:export_job_download', args=[job.pk]) if job.status == 'done' else None,
+    }
+
+@login_required
+@user_passes_test(is_admin)
+def export_job_status(request, pk):
+    """Progress of a background export, polled by the settings page"""
+    job = get_object_or_404(ExportJob, pk=pk)
+    response = JsonResponse(_export_job_json(job))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+@login_required
+@user_passes_test(is_admin)
+def export_job_download(request, pk):
+    """Download a finished background export"""
+    job = get_object_or_404(ExportJob, pk=pk, status='done')
+    try:
+        artifact = job.file.open('rb')
+    except FileNotFoundError:
+        raise Http404('Export file no longer exists.')
+    return FileResponse(artifact, as_attachment=True, filename=f'{job.dataset}_export_{job.pk}.{job.format}')
+
+@login_required
+@user_passes_test(is_admin)
+def delta_export(request):
+    """
+    Rows changed since ?since=<ISO watermark> as NDJSON (upserts, then deletions),
+    ending with the next watermark, which is also sent as X-Next-Watermark.
+    Without ?since= every row is returned. ?dataset= (repeatable) limits the
+    feed to jobs, applications, seeker_profiles or employer_profiles; ?gzip=1.
+    """
+    since = None
+    if request.GET.get('since'):
+        try:
+            since = delta.parse_watermark(request.GET['since'])
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+    datasets = request.GET.getlist('dataset')
+    unknown = [name for name in datasets if name not in delta.FEEDS]
+    if unknown:
+        return JsonResponse({'error': f'Unknown dataset: {", ".join(unknown)}'}, status=400)
+    
+    until = delta.next_watermark()
+    chunks = delta.ndjson_chunks(delta.changes(since, until, datasets), until)
+    if request.GET.get('gzip') == '1':
+        response = StreamingHttpResponse(exports.gzip_chunks(chunks), content_type='application/gzip')
+    else:
+        response = StreamingHttpResponse(chunks, content_type='application/x-ndjson')
+    response['X-Next-Watermark'] = until.isoformat()
     return response
 
 # Quick Stats API for Dashboard Widgets
+# Widgets poll every 30 seconds; the numbers are recomputed at most this often
+QUICK_STATS_SECONDS = 15
+
+def _count_sql(queryset):
+    """SQL and params of a scalar SELECT COUNT(...) over `queryset`"""
+    counted = queryset.order_by().annotate(total=Func(F('pk'), function='COUNT')).values('total')
+    return counted.query.sql_with_params()
+
+def compute_quick_stats():
+    """The widget counters in one round trip: a SELECT of scalar subqueries, each counting over an indexed column"""
+    today = timezone.localdate()
+    start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+    end = start + timedelta(days=1)
+    
+    counts = {
+        'users_today': User.objects.filter(date_joined__gte=start, date_joined__lt=end),
+        'jobs_today': Job.objects.filter(created_at__gte=start, created_at__lt=end),
+        'applications_today': JobApplication.objects.filter(applied_date__gte=start, applied_date__lt=end),
+        'pending_applications': JobApplication.objects.filter(status='pending'),
+    }
+    columns, params = [], []
+    for name, queryset in counts.items():
+        sql, count_params = _count_sql(queryset)
+        columns.append(f'({sql}) AS {connection.ops.quote_name(name)}')
+        params.extend(count_params)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT ' + ', '.join(columns), params)
+        stats = dict(zip(counts, cursor.fetchone()))
+    body = json.dumps(stats, sort_keys=True)
+    return {'body': body, 'etag': '"%s"' % hashlib.md5(body.encode()).hexdigest()}
+
+def quick_stats():
+    """
+    Cached quick stats, refreshed by one request at a time.
+    
+    The entry outlives its freshness window; once stale, the request that wins
+    the refresh lock recomputes it while concurrent ones keep serving the old
+    value, so an expiry never sends every poller to the database at once.
+    """
+    entry = cache.get('admin:quick-stats')
+    now = time.time()
+    if entry and entry['fresh_until'] > now:
+        return entry
+    # With nothing to fall back on (cold cache) compute without waiting for the lock
+    locked = entry is not None
+    if locked and not cache.add('admin:quick-stats:lock', 1, QUICK_STATS_SECONDS):
+        return entry
+    try:
+        entry = compute_quick_stats()
+        entry['fresh_until'] = now + QUICK_STATS_SECONDS
+        cache.set('admin:quick-stats', entry, QUICK_STATS_SECONDS * 20)
+    finally:
+        if locked:
+            cache.delete('admin:quick-stats:lock')
+    return entry
+
 @login_required
 @user_passes_test(is_staff_or_admin)
 def quick_stats_api(request):
     """API endpoint for dashboard widgets"""
-    
-    stats = {
-        'users_today': User.objects.filter(date_joined__date=timezone.now().date()).count(),
-        'jobs_today': Job.objects.filter(created_at__date=timezone.now().date()).count(),
-        'applications_today': JobApplication.objects.filter(applied_date__date=timezone.now().date()).count(),
-        'pending_applications': JobApplication.objects.filter(status='pending').count(),
-    }
-    
-    return JsonResponse(stats)
\ No newline at end of file
+    entry = quick_stats()
+    response = HttpResponse(entry['body'], content_type='application/json')
+    response['ETag'] = entry['etag']
+    # Browsers revalidate each poll; unchanged numbers come back as 304 with no body
+    patch_cache_control(response, private=True, no_cache=True)
+    return get_conditional_response(request, etag=entry['etag'], response=response)
\ No newline at end of file
@@ -150,6 +150,28 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cache (anonymous page cache)
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The per-process memory cache suits a single worker; point DJANGO_CACHE_BACKEND /
+# DJANGO_CACHE_LOCATION at a shared cache (e.g. Redis or Memcached) when running
+# several, so page invalidations reach every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'job-portal'),
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+PAGE_CACHE_SECONDS = 300
+PAGE_CACHE_MAX_AGE = 60
+
+# Scheme and host for links in emails sent outside a request (job alert digests)
+SITE_URL = os.environ.get('SITE_URL', 'https://job.meedmehadi.com')
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -166,6 +188,9 @@ USE_TZ = True
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Files only served through permission-checked views (admin data exports); keep outside MEDIA_ROOT
+PRIVATE_MEDIA_ROOT = os.environ.get('PRIVATE_MEDIA_ROOT', BASE_DIR / 'private_media')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
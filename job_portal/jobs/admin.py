@@ -1,21 +1,43 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import JobCategory, Job, JobApplication, SavedJob
+from .models import (
+    JobCategory, Job, JobApplication, SavedJob, Location, LocationAlias, Skill, SkillAlias
+)
+from .search import search_jobs
 
 @admin.register(JobCategory)
 class JobCategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'jobs_count', 'created_at']
+    list_display = ['name', 'active_jobs_count', 'created_at']
     search_fields = ['name']
-    
-    def jobs_count(self, obj):
-        return obj.jobs.count()
-    jobs_count.short_description = 'Number of Jobs'
+    readonly_fields = ['active_jobs_count', 'created_at']
+
+class LocationAliasInline(admin.TabularInline):
+    model = LocationAlias
+    extra = 1
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ['name', 'city', 'state', 'country', 'active_jobs_count']
+    search_fields = ['name', 'key']
+    readonly_fields = ['key', 'active_jobs_count', 'created_at']
+    inlines = [LocationAliasInline]
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key', 'created_at']
+    search_fields = ['name', 'key', 'aliases__alias']
+    readonly_fields = ['key', 'created_at']
+    inlines = [SkillAliasInline]
 
 @admin.register(Job)
 class JobAdmin(admin.ModelAdmin):
     list_display = [
         'title', 'company', 'category', 'job_type', 'status', 
-        'created_at', 'applications_count', 'views_count'
+        'created_at', 'applications', 'saves_count', 'live_views'
     ]
     list_filter = [
         'status', 'job_type', 'experience_level', 'category', 
@@ -25,7 +47,7 @@ class JobAdmin(admin.ModelAdmin):
         'title', 'company__company_name', 'description', 
         'required_skills', 'location'
     ]
-    readonly_fields = ['views_count', 'created_at', 'updated_at']
+    readonly_fields = ['live_views', 'applications_count', 'saves_count', 'created_at', 'updated_at']
     
     fieldsets = (
         ('Basic Information', {
@@ -47,20 +69,33 @@ class JobAdmin(admin.ModelAdmin):
             'fields': ('required_skills', 'preferred_skills')
         }),
         ('Metadata', {
-            'fields': ('views_count', 'created_at', 'updated_at'),
+            'fields': ('live_views', 'applications_count', 'saves_count', 'created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
     
-    def applications_count(self, obj):
-        count = obj.applications.count()
+    def applications(self, obj):
+        count = obj.applications_count
         if count > 0:
             return format_html(
                 '<a href="/admin/jobs/jobapplication/?job__id__exact={}">{} applications</a>',
                 obj.pk, count
             )
         return "0 applications"
-    applications_count.short_description = 'Applications'
+    applications.short_description = 'Applications'
+    applications.admin_order_field = 'applications_count'
+    
+    def live_views(self, obj):
+        # Includes views still buffered in this process (jobs.counters)
+        return obj.live_views_count
+    live_views.short_description = 'Views'
+    live_views.admin_order_field = 'views_count'
+    
+    def get_search_results(self, request, queryset, search_term):
+        # search_fields only enables the search box; matching goes through the FTS index
+        if not search_term:
+            return queryset, False
+        return search_jobs(queryset, search_term), False
 
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
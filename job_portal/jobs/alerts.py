@@ -0,0 +1,220 @@
+# jobs/alerts.py - Saved-search job alerts (reverse matching of new jobs against stored searches)
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .forms import JobSearchForm
+from .models import JobAlert, Location, SavedSearch, SavedSearchTerm, Skill
+from .search import TOKEN_RE
+
+# Keyword terms are indexed by this many leading characters so that prefix
+# searches ("pyth") still meet the full words of a job ("python")
+KEYWORD_PREFIX = 3
+
+# job_list parameters a saved search keeps
+SAVED_PARAMETERS = (
+    'search', 'category', 'location', 'skill', 'job_type', 'experience_level',
+    'salary_min', 'salary_max', 'is_remote',
+)
+
+ALERT_BATCH_SIZE = 500
+
+
+def _tokens(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def create_saved_search(profile, params, name=''):
+    """Build a SavedSearch from job_list parameters; returns None when they don't validate"""
+    form = JobSearchForm(params)
+    if not form.is_valid():
+        return None
+    data = form.cleaned_data
+
+    saved = SavedSearch(
+        user=profile,
+        query={key: params[key] for key in SAVED_PARAMETERS if params.get(key)},
+        keywords=' '.join(_tokens(data['search'])),
+        category=data['category'],
+        job_type=data['job_type'],
+        experience_level=data['experience_level'],
+        salary_min=data['salary_min'],
+        salary_max=data['salary_max'],
+        is_remote=data['is_remote'],
+    )
+    location = data['location'].strip()
+    if location:
+        saved.has_location = True
+        saved.location_ids = (
+            [int(location)] if location.isdigit() else Location.objects.match_ids(location)
+        )
+    skill = (params.get('skill') or '').strip()
+    if skill:
+        skills = Skill.objects.resolve_many([skill], create=False)
+        saved.skill = skills[0] if skills else None
+        if saved.skill is None:
+            return None
+    saved.name = name or describe(saved, location, skill)
+    saved.save()
+    index_saved_search(saved)
+    return saved
+
+
+def describe(saved, location='', skill=''):
+    parts = [saved.keywords or 'All jobs']
+    if skill:
+        parts.append(f'skill {skill}')
+    if location:
+        parts.append(f'in {location}')
+    if saved.job_type:
+        parts.append(f'[{saved.get_job_type_display()}]')
+    if saved.category:
+        parts.append(f'({saved.category.name})')
+    return ' '.join(parts)[:200]
+
+
+def search_terms(saved):
+    """
+    The reverse-index terms of a saved search.
+
+    Only its most selective criterion is indexed: every match must carry that
+    term, so looking it up never misses a search, and the rest is checked by
+    `matches`.
+    """
+    if saved.skill_id:
+        return [('skill', str(saved.skill_id))]
+    if saved.has_location:
+        return [('location', str(location_id)) for location_id in saved.location_ids]
+    if saved.category_id:
+        return [('category', str(saved.category_id))]
+    if saved.keywords:
+        longest = max(saved.keywords.split(), key=len)
+        return [('keyword', longest[:KEYWORD_PREFIX])]
+    if saved.job_type:
+        return [('job_type', saved.job_type)]
+    return [('any', '')]
+
+
+def index_saved_search(saved):
+    saved.terms.all().delete()
+    SavedSearchTerm.objects.bulk_create([
+        SavedSearchTerm(saved_search=saved, field=field, value=value)
+        for field, value in search_terms(saved)
+    ])
+
+
+def job_document(job):
+    """Tokens job_list's keyword search would match the job on"""
+    return set(_tokens(' '.join([
+        job.title, job.company.company_name, job.required_skills or '',
+        job.preferred_skills or '', job.location, job.description,
+    ])))
+
+
+def matches(saved, job, document, skill_ids):
+    """Full check of a candidate search against a job, mirroring job_list's filters"""
+    if saved.skill_id and saved.skill_id not in skill_ids:
+        return False
+    if saved.has_location and job.normalized_location_id not in saved.location_ids:
+        return False
+    if saved.category_id and saved.category_id != job.category_id:
+        return False
+    if saved.job_type and saved.job_type != job.job_type:
+        return False
+    if saved.experience_level and saved.experience_level != job.experience_level:
+        return False
+    if saved.salary_min and (job.salary_min is None or job.salary_min < saved.salary_min):
+        return False
+    if saved.salary_max and (job.salary_max is None or job.salary_max > saved.salary_max):
+        return False
+    if saved.is_remote and not job.is_remote:
+        return False
+    # Every keyword must prefix some word of the job, like the FTS prefix query
+    for keyword in saved.keywords.split():
+        if not any(token.startswith(keyword) for token in document):
+            return False
+    return True
+
+
+def percolate(job):
+    """
+    Queue alerts for every active saved search the job matches.
+
+    Candidates come from the term index, so the work grows with the number of
+    searches sharing a term with the job, not with all saved searches.
+    """
+    document = job_document(job)
+    skill_ids = set(job.job_skills.values_list('skill_id', flat=True))
+
+    lookup = Q(field='any') | Q(field='job_type', value=job.job_type)
+    prefixes = {token[:length] for token in document for length in range(1, KEYWORD_PREFIX + 1)}
+    lookup |= Q(field='keyword', value__in=prefixes)
+    if skill_ids:
+        lookup |= Q(field='skill', value__in=[str(skill_id) for skill_id in skill_ids])
+    if job.normalized_location_id:
+        lookup |= Q(field='location', value=str(job.normalized_location_id))
+    if job.category_id:
+        lookup |= Q(field='category', value=str(job.category_id))
+
+    candidates = SavedSearch.objects.filter(
+        is_active=True, pk__in=SavedSearchTerm.objects.filter(lookup).values('saved_search')
+    ).exclude(user__applications__job=job)
+
+    alerts = [
+        JobAlert(saved_search=saved, job=job)
+        for saved in candidates.iterator()
+        if matches(saved, job, document, skill_ids)
+    ]
+    JobAlert.objects.bulk_create(alerts, batch_size=ALERT_BATCH_SIZE, ignore_conflicts=True)
+    return len(alerts)
+
+
+def job_url(job):
+    """Absolute link to a job, for emails sent outside a request"""
+    return settings.SITE_URL.rstrip('/') + reverse('jobs:job_detail', kwargs={'pk': job.pk})
+
+
+def send_pending_alerts(batch_size=ALERT_BATCH_SIZE):
+    """Email each seeker one digest of their unsent alerts; returns the number of emails"""
+    sent = 0
+    while True:
+        pending = list(
+            JobAlert.objects.filter(sent_at__isnull=True)
+            .select_related('job__company', 'saved_search__user__user')
+            .order_by('saved_search__user', 'id')[:batch_size]
+        )
+        if not pending:
+            return sent
+
+        digests = {}
+        for alert in pending:
+            digests.setdefault(alert.saved_search.user, []).append(alert)
+
+        messages = []
+        for profile, alerts in digests.items():
+            # One line per job even when several searches matched it
+            jobs = {alert.job.pk: alert.job for alert in alerts if alert.job.status == 'active'}
+            lines = [
+                f'- {job.title} at {job.company.company_name} ({job.location}): '
+                f'{job_url(job)}'
+                for job in jobs.values()
+            ]
+            if lines and profile.user.email:
+                searches = sorted({alert.saved_search.name for alert in alerts})
+                messages.append((
+                    f'{len(lines)} new job(s) for your saved searches',
+                    f'New jobs matching {", ".join(searches)}:\n\n' + '\n'.join(lines),
+                    settings.DEFAULT_FROM_EMAIL,
+                    [profile.user.email],
+                ))
+        send_mass_mail(messages)
+        sent += len(messages)
+
+        now = timezone.now()
+        JobAlert.objects.filter(pk__in=[alert.pk for alert in pending]).update(sent_at=now)
+        SavedSearch.objects.filter(
+            pk__in={alert.saved_search_id for alert in pending}
+        ).update(last_alerted_at=now)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+    
+    def ready(self):
+        # Import signals to ensure they are registered
+        import jobs.signals
@@ -0,0 +1,135 @@
+# jobs/counters.py - Buffered, write-coalescing job view counter
+
+import atexit
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .hll import HyperLogLog
+
+# Longest a counted view may wait in memory before it reaches the database
+FLUSH_INTERVAL_SECONDS = getattr(settings, 'JOB_VIEWS_FLUSH_SECONDS', 10)
+
+# Flush early once this many views are buffered
+MAX_PENDING_VIEWS = getattr(settings, 'JOB_VIEWS_MAX_PENDING', 1000)
+
+
+class ViewCounter:
+    """
+    Per-process buffer of job view increments.
+
+    Views are summed in memory and written as one `views_count = views_count + n`
+    UPDATE per distinct increment, so concurrent workers never lose counts and
+    the hot job_detail path doesn't take the database write lock. A daemon
+    thread flushes at least every FLUSH_INTERVAL_SECONDS, bounding staleness,
+    and is woken early once max_pending views are buffered; requests never
+    write themselves.
+
+    Counts and viewer sketches are kept per (job, day) so the same flush
+    feeds JobDailyStats and the stored HyperLogLog sketches.
+    """
+
+    def __init__(self, interval=FLUSH_INTERVAL_SECONDS, max_pending=MAX_PENDING_VIEWS):
+        self.interval = interval
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.sketches = {}
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.exit_hook_registered = False
+
+    def add(self, job_id, count=1, viewer=None):
+        """Buffer `count` views of a job, adding `viewer` to that day's HyperLogLog sketch"""
+        key = (job_id, timezone.localdate())
+        with self.lock:
+            self.pending[key] += count
+            if viewer is not None:
+                self.sketches.setdefault(key, HyperLogLog()).add(viewer)
+            full = sum(self.pending.values()) >= self.max_pending
+        self._ensure_thread()
+        if full:
+            self.wakeup.set()
+
+    def pending_for(self, job_id):
+        """Views of `job_id` counted by this process but not yet written"""
+        with self.lock:
+            return sum(count for (pending_id, _), count in self.pending.items() if pending_id == job_id)
+
+    def flush(self):
+        """Write buffered views; returns how many were written"""
+        from .models import Job
+        from .stats import merge_viewer_sketches, record_many
+
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            sketches, self.sketches = self.sketches, {}
+        if not pending:
+            return 0
+
+        totals = Counter()
+        for (job_id, _), count in pending.items():
+            totals[job_id] += count
+
+        # Jobs with the same increment share one UPDATE
+        by_increment = {}
+        for job_id, count in totals.items():
+            by_increment.setdefault(count, []).append(job_id)
+        try:
+            with transaction.atomic():
+                for count, job_ids in by_increment.items():
+                    Job.objects.filter(pk__in=job_ids).update(views_count=F('views_count') + count)
+                record_many({key: {'views': count} for key, count in pending.items()})
+                merge_viewer_sketches(sketches)
+        except Exception:
+            # Keep the views for the next attempt
+            with self.lock:
+                self.pending.update(pending)
+                for key, sketch in sketches.items():
+                    self.sketches.setdefault(key, HyperLogLog()).merge(sketch)
+            raise
+        return sum(pending.values())
+
+    def _ensure_thread(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self._run, name='job-view-counter', daemon=True)
+            self.thread.start()
+            if not self.exit_hook_registered:
+                atexit.register(self.flush)
+                self.exit_hook_registered = True
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                # Database unavailable; the views stay buffered, and a full
+                # buffer waits out the interval rather than retrying at once
+                time.sleep(self.interval)
+
+
+view_counter = ViewCounter()
+
+
+def preserve_counters(instance, counter_fields, kwargs):
+    """
+    Leave F()-maintained counter columns out of a full save of an existing row,
+    so a stale in-memory copy never overwrites concurrent increments.
+    """
+    if instance._state.adding or kwargs.get('force_insert') or kwargs.get('update_fields') is not None:
+        return
+    kwargs['update_fields'] = [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in counter_fields
+    ]
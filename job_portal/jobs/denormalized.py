@@ -0,0 +1,55 @@
+# jobs/denormalized.py - Maintained counter columns: atomic adjustments, verification and repair
+
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import EmployerProfile
+from .models import Job, JobApplication, JobCategory, SavedJob
+
+
+def adjust(deltas):
+    """Apply {(model, pk, field): delta} as one F() UPDATE each; counts never go below zero"""
+    for (model, pk, field), delta in deltas.items():
+        if not delta or pk is None:
+            continue
+        rows = model.objects.filter(pk=pk)
+        if delta < 0:
+            rows = rows.filter(**{f'{field}__gte': -delta})
+        rows.update(**{field: F(field) + delta})
+
+
+def counter_columns():
+    """(model, field, counted queryset, its foreign key to model) for every maintained counter"""
+    return [
+        (Job, 'applications_count', JobApplication.objects.all(), 'job'),
+        (Job, 'saves_count', SavedJob.objects.all(), 'job'),
+        (JobCategory, 'active_jobs_count', Job.objects.filter(status='active'), 'category'),
+        (EmployerProfile, 'active_jobs_count', Job.objects.filter(status='active'), 'company'),
+    ]
+
+
+def _expected(counted, key):
+    totals = counted.filter(**{key: OuterRef('pk')}).order_by().values(key).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(totals), Value(0))
+
+
+def find_drift():
+    """Rows whose counter disagrees with a recount: [(model, field, pk, stored, expected)]"""
+    drift = []
+    for model, field, counted, key in counter_columns():
+        rows = model.objects.annotate(expected=_expected(counted, key)).exclude(**{field: F('expected')})
+        drift.extend(
+            (model, field, pk, stored, expected)
+            for pk, stored, expected in rows.values_list('pk', field, 'expected')
+        )
+    return drift
+
+
+def repair(drift):
+    """Recount the drifted rows in place (one correlated UPDATE per counter); returns rows fixed"""
+    fixed = 0
+    for model, field, counted, key in counter_columns():
+        pks = [pk for drift_model, drift_field, pk, _, _ in drift if drift_model is model and drift_field == field]
+        if pks:
+            fixed += model.objects.filter(pk__in=pks).update(**{field: _expected(counted, key)})
+    return fixed
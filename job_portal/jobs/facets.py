@@ -0,0 +1,45 @@
+# jobs/facets.py - Sidebar facet counts for job search results
+
+from django.db.models import Count
+
+from .models import Job, JobCategory
+
+
+def job_facets(queryset, categories=None):
+    """
+    Count category, job type, experience level and remote/onsite values for
+    the jobs in `queryset` using a single GROUP BY over all facet columns.
+    """
+    rows = queryset.order_by().values(
+        'category_id', 'job_type', 'experience_level', 'is_remote'
+    ).annotate(count=Count('id'))
+
+    by_category, by_job_type, by_experience, by_remote = {}, {}, {}, {}
+    for row in rows:
+        count = row['count']
+        by_category[row['category_id']] = by_category.get(row['category_id'], 0) + count
+        by_job_type[row['job_type']] = by_job_type.get(row['job_type'], 0) + count
+        by_experience[row['experience_level']] = by_experience.get(row['experience_level'], 0) + count
+        by_remote[row['is_remote']] = by_remote.get(row['is_remote'], 0) + count
+
+    if categories is None:
+        categories = JobCategory.objects.all()
+
+    return {
+        'category': [
+            {'value': category.id, 'label': category.name, 'count': by_category.get(category.id, 0)}
+            for category in categories
+        ],
+        'job_type': [
+            {'value': value, 'label': label, 'count': by_job_type.get(value, 0)}
+            for value, label in Job.JOB_TYPE_CHOICES
+        ],
+        'experience_level': [
+            {'value': value, 'label': label, 'count': by_experience.get(value, 0)}
+            for value, label in Job.EXPERIENCE_CHOICES
+        ],
+        'remote': {
+            'remote': by_remote.get(True, 0),
+            'onsite': by_remote.get(False, 0),
+        },
+    }
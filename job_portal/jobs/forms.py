@@ -129,6 +129,15 @@ class JobSearchForm(forms.Form):
         })
     )
     
+    salary_max = forms.IntegerField(
+        required=False,
+        min_value=0,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Maximum salary...'
+        })
+    )
+    
     is_remote = forms.BooleanField(
         required=False,
         widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
@@ -0,0 +1,124 @@
+# jobs/gazetteer.py - Offline city gazetteer and distance helpers
+
+import csv
+import math
+import os
+from functools import lru_cache
+
+from .locations import normalize_key
+
+GAZETTEER_FILE = os.path.join(os.path.dirname(__file__), 'data', 'cities.csv')
+
+EARTH_RADIUS_KM = 6371.0
+
+# Grid cells are GRID_DEGREES x GRID_DEGREES (roughly 55 km at the equator)
+GRID_DEGREES = 0.5
+GRID_COLUMNS = int(360 / GRID_DEGREES)
+
+# Alternative spellings for the country / city parts of a place name
+COUNTRY_ALIASES = {
+    'us': 'usa',
+    'united states': 'usa',
+    'united states of america': 'usa',
+    'uk': 'united kingdom',
+    'england': 'united kingdom',
+    'uae': 'united arab emirates',
+    'bd': 'bangladesh',
+}
+CITY_ALIASES = {
+    'chattogram': 'chittagong',
+    'barishal': 'barisal',
+    'cumilla': 'comilla',
+    'jashore': 'jessore',
+    'bogura': 'bogra',
+    'nyc': 'new york',
+    'sf': 'san francisco',
+}
+
+
+@lru_cache(maxsize=1)
+def _load():
+    """Index every city under 'city', 'city, state', 'city, country' and the full name"""
+    index = {}
+    with open(GAZETTEER_FILE, newline='', encoding='utf-8') as handle:
+        for row in csv.DictReader(handle):
+            point = (float(row['latitude']), float(row['longitude']))
+            city = normalize_key(row['name'])
+            state = normalize_key(row['state'])
+            country = normalize_key(row['country'])
+            keys = [city, f'{city}, {country}']
+            if state:
+                keys += [f'{city}, {state}', f'{city}, {state}, {country}']
+            for key in keys:
+                # Earlier rows win, so the file is ordered by priority
+                index.setdefault(key, point)
+    return index
+
+
+def geocode(*parts):
+    """(latitude, longitude) for a place such as geocode('Dhaka, Bangladesh') or geocode(city, state, country)"""
+    text = ', '.join(part for part in parts if part)
+    key_parts = normalize_key(text).split(', ')
+    if not key_parts or not key_parts[0]:
+        return None
+
+    key_parts[0] = CITY_ALIASES.get(key_parts[0], key_parts[0])
+    key_parts[-1] = COUNTRY_ALIASES.get(key_parts[-1], key_parts[-1])
+
+    index = _load()
+    # Try the most specific form first, then drop qualifiers one at a time
+    candidates = [', '.join(key_parts)]
+    if len(key_parts) == 3:
+        candidates += [f'{key_parts[0]}, {key_parts[2]}', f'{key_parts[0]}, {key_parts[1]}']
+    candidates.append(key_parts[0])
+    for key in candidates:
+        if key in index:
+            return index[key]
+    return None
+
+
+def grid_cell(latitude, longitude):
+    """Integer id of the grid cell containing a point"""
+    row = int(math.floor((latitude + 90) / GRID_DEGREES))
+    column = int(math.floor((longitude + 180) / GRID_DEGREES)) % GRID_COLUMNS
+    return row * GRID_COLUMNS + column
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lon, max_lon) enclosing a circle; longitudes may wrap past +/-180"""
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 1e-6 or delta_lat >= 90:
+        delta_lon = 180.0
+    else:
+        delta_lon = min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return (
+        max(-90.0, latitude - delta_lat),
+        min(90.0, latitude + delta_lat),
+        longitude - delta_lon,
+        longitude + delta_lon,
+    )
+
+
+def cells_for_box(min_lat, max_lat, min_lon, max_lon):
+    """Grid cell ids covering a bounding box"""
+    cells = set()
+    row_start = int(math.floor((min_lat + 90) / GRID_DEGREES))
+    row_end = int(math.floor((min(max_lat, 89.999999) + 90) / GRID_DEGREES))
+    column_start = int(math.floor((min_lon + 180) / GRID_DEGREES))
+    column_end = int(math.floor((max_lon + 180) / GRID_DEGREES))
+    if column_end - column_start >= GRID_COLUMNS:
+        column_start, column_end = 0, GRID_COLUMNS - 1
+    for row in range(row_start, row_end + 1):
+        for column in range(column_start, column_end + 1):
+            cells.add(row * GRID_COLUMNS + column % GRID_COLUMNS)
+    return cells
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
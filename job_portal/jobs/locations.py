@@ -0,0 +1,51 @@
+# jobs/locations.py - Helpers for normalizing free-text job locations
+
+import re
+
+# Common shorthand seen in postings -> canonical "City, State" / "City, Country" text
+DEFAULT_ALIASES = {
+    'sf': 'San Francisco, CA',
+    'san francisco': 'San Francisco, CA',
+    'san francisco, ca, usa': 'San Francisco, CA',
+    'bay area': 'San Francisco, CA',
+    'nyc': 'New York, NY',
+    'new york': 'New York, NY',
+    'new york city': 'New York, NY',
+    'new york, ny, usa': 'New York, NY',
+    'la': 'Los Angeles, CA',
+    'los angeles': 'Los Angeles, CA',
+    'dc': 'Washington, DC',
+    'austin': 'Austin, TX',
+    'wfh': 'Remote',
+    'work from home': 'Remote',
+    'anywhere': 'Remote',
+    'dhaka': 'Dhaka, Bangladesh',
+    'dac': 'Dhaka, Bangladesh',
+    'ctg': 'Chittagong, Bangladesh',
+    'chattogram': 'Chittagong, Bangladesh',
+}
+
+
+def normalize_key(text):
+    """Lowercase, strip punctuation and collapse whitespace: ' San  Francisco,CA ' -> 'san francisco, ca'"""
+    text = re.sub(r'[^\w\s,]', ' ', (text or '').lower())
+    parts = [' '.join(part.split()) for part in text.split(',')]
+    return ', '.join(part for part in parts if part)
+
+
+def parse_location(text):
+    """Split display text into (name, city, state, country)"""
+    parts = [' '.join(part.split()) for part in (text or '').split(',')]
+    parts = [part for part in parts if part]
+    name = ', '.join(parts)
+    city = parts[0] if parts else ''
+    state = country = ''
+    if len(parts) >= 3:
+        state, country = parts[1], parts[-1]
+    elif len(parts) == 2:
+        # "Austin, TX" carries a state code, "Dhaka, Bangladesh" a country
+        if len(parts[1]) == 2 and parts[1].isupper():
+            state = parts[1]
+        else:
+            country = parts[1]
+    return name, city, state, country
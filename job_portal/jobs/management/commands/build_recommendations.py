@@ -0,0 +1,56 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from accounts.models import JobSeekerProfile
+from jobs import recommendations
+
+
+def _compute_chunk(profile_ids):
+    """Worker: score one chunk of profiles and hand the rows back to the parent for writing"""
+    profiles = list(JobSeekerProfile.objects.filter(pk__in=profile_ids))
+    return recommendations.compute_recommendations(profiles)
+
+
+class Command(BaseCommand):
+    help = 'Precompute the recommended job list of every job seeker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Profiles scored per batch')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Worker processes (1 scores in this process)')
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        generation = recommendations.current_generation() + 1
+
+        profile_ids = list(JobSeekerProfile.objects.order_by('pk').values_list('pk', flat=True))
+        chunks = [profile_ids[i:i + chunk_size] for i in range(0, len(profile_ids), chunk_size)]
+
+        # Build the job matrix once; forked workers inherit it
+        recommendations.job_matrix.refresh()
+
+        # Workers rely on fork to inherit Django setup and the matrix
+        parallel = 'fork' in multiprocessing.get_all_start_methods()
+        if parallel and options['workers'] > 1 and len(chunks) > 1:
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=options['workers'], mp_context=context) as pool:
+                results = pool.map(_compute_chunk, chunks)
+                written = self._save(results, generation)
+        else:
+            written = self._save(map(_compute_chunk, chunks), generation)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored recommendations for {written} job seekers (generation {generation}).'
+        ))
+
+    def _save(self, results, generation):
+        written = 0
+        for rows in results:
+            recommendations.save_recommendations(rows, generation)
+            written += len(rows)
+        return written
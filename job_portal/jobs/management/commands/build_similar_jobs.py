@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from jobs import similarity
+
+class Command(BaseCommand):
+    help = 'Rebuild the precomputed "similar jobs" neighbour lists, or with --pending update those of saved jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Jobs scored per batch')
+        parser.add_argument('--pending', action='store_true',
+                            help='Only update lists for jobs saved since the last run (schedule every minute)')
+
+    def handle(self, *args, **options):
+        if options['pending']:
+            count = similarity.process_pending()
+            self.stdout.write(self.style.SUCCESS(f'Updated neighbours for {count} saved jobs.'))
+            return
+        count = similarity.rebuild_neighbours(chunk_size=max(1, options['chunk_size']))
+        self.stdout.write(self.style.SUCCESS(f'Stored neighbours for {count} jobs.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs import search
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text job search index from the jobs table'
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            self.stdout.write(self.style.WARNING('Full-text index requires SQLite; nothing to do.'))
+            return
+
+        count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} jobs.'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import SiteCounter
+
+class Command(BaseCommand):
+    help = 'Recount the homepage site counters and repair any drift (run periodically, e.g. hourly)'
+
+    def handle(self, *args, **options):
+        repaired = SiteCounter.objects.reconcile()
+        self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} site counter(s).'))
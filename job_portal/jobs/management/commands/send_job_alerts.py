@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs import alerts
+
+class Command(BaseCommand):
+    help = 'Email queued saved-search job alerts as one digest per job seeker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=alerts.ALERT_BATCH_SIZE,
+                            help='Alerts handled per batch')
+
+    def handle(self, *args, **options):
+        sent = alerts.send_pending_alerts(batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(f'Sent {sent} alert emails.'))
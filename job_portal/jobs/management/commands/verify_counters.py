@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from jobs import denormalized
+
+class Command(BaseCommand):
+    help = 'Check the maintained counter columns against a recount, optionally repairing drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true',
+                            help='Rewrite drifted counters with the recounted values')
+
+    def handle(self, *args, **options):
+        drift = denormalized.find_drift()
+        for model, field, pk, stored, expected in drift:
+            self.stdout.write(f'{model._meta.label} #{pk} {field}: stored {stored}, expected {expected}')
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('All counters are correct.'))
+        elif options['repair']:
+            fixed = denormalized.repair(drift)
+            self.stdout.write(self.style.SUCCESS(f'Repaired {fixed} counter(s).'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{len(drift)} counter(s) drifted; run with --repair to fix.'))
@@ -0,0 +1,117 @@
+# jobs/matching.py - Score job applicants against a posting's requirements
+
+import numpy as np
+from scipy import sparse
+
+from .models import Job, JobApplication, ProfileSkill
+
+EXPERIENCE_LEVELS = [value for value, _ in Job.EXPERIENCE_CHOICES]
+
+# Points each component contributes to a 0-100 match score
+SCORE_WEIGHTS = {
+    'required_skills': 55.0,
+    'preferred_skills': 15.0,
+    'experience': 20.0,
+    'salary': 10.0,
+}
+
+
+def _skill_coverage(profile_skills, skill_ids):
+    """Fraction of `skill_ids` held by each applicant; `profile_skills` is applicants x skill columns"""
+    if not skill_ids:
+        return None
+    wanted = np.zeros(profile_skills.shape[1], dtype=np.float32)
+    wanted[skill_ids] = 1.0
+    return (profile_skills @ wanted) / len(skill_ids)
+
+
+def _experience_fit(levels, job_level):
+    """1 for the posted level, 0.5 one step away, 0.25 two steps above (over-qualified), else 0"""
+    if job_level not in EXPERIENCE_LEVELS:
+        return None
+    distance = levels - EXPERIENCE_LEVELS.index(job_level)
+    fit = np.where(distance == 0, 1.0, np.where(np.abs(distance) == 1, 0.5, 0.0))
+    fit = np.where(distance == 2, 0.25, fit)
+    return np.where(levels < 0, 0.0, fit)
+
+
+def _salary_fit(expected, job_max):
+    """1 when the applicant's minimum fits the budget, tapering to 0 at twice the budget"""
+    if not job_max:
+        return None
+    fit = np.clip(2.0 - expected / job_max, 0.0, 1.0)
+    # No stated expectation counts as a fit
+    return np.where(np.isnan(expected), 1.0, fit)
+
+
+def score_applications(job, applications=None):
+    """
+    Compute match_score (0-100) for a job's applications in one vectorized pass.
+
+    Scores are written with a single bulk update. Defaults to the applications
+    that have no score yet. Returns how many were scored.
+    """
+    if applications is None:
+        applications = job.applications.filter(match_score__isnull=True)
+    applications = list(applications.select_related('applicant').only(
+        'applicant__experience_level', 'applicant__desired_salary_min'
+    ))
+    if not applications:
+        return 0
+
+    # Skill columns are local to this job: its own skills only
+    job_skills = list(job.job_skills.values_list('skill_id', 'is_required'))
+    column = {skill_id: i for i, (skill_id, _) in enumerate(job_skills)}
+    required = [column[skill_id] for skill_id, is_required in job_skills if is_required]
+    preferred = [column[skill_id] for skill_id, is_required in job_skills if not is_required]
+
+    row = {application.applicant_id: i for i, application in enumerate(applications)}
+    rows, columns = [], []
+    for profile_id, skill_id in ProfileSkill.objects.filter(
+        profile__in=list(row), skill__in=list(column)
+    ).values_list('profile_id', 'skill_id'):
+        rows.append(row[profile_id])
+        columns.append(column[skill_id])
+    profile_skills = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+        shape=(len(applications), max(len(column), 1))
+    )
+
+    levels = np.array([
+        EXPERIENCE_LEVELS.index(a.applicant.experience_level)
+        if a.applicant.experience_level in EXPERIENCE_LEVELS else -1
+        for a in applications
+    ])
+    expected = np.array([
+        a.applicant.desired_salary_min if a.applicant.desired_salary_min is not None else np.nan
+        for a in applications
+    ], dtype=np.float64)
+
+    components = {
+        'required_skills': _skill_coverage(profile_skills, required),
+        'preferred_skills': _skill_coverage(profile_skills, preferred),
+        'experience': _experience_fit(levels, job.experience_level),
+        'salary': _salary_fit(expected, job.salary_max or job.salary_min),
+    }
+    # Components the posting doesn't specify are left out and the rest rescaled to 100
+    used = {name: values for name, values in components.items() if values is not None}
+    total_weight = sum(SCORE_WEIGHTS[name] for name in used) or 1.0
+    scores = np.zeros(len(applications))
+    for name, values in used.items():
+        scores += SCORE_WEIGHTS[name] * values
+    scores = np.round(scores * 100.0 / total_weight, 1)
+
+    for application, score in zip(applications, scores.tolist()):
+        application.match_score = score
+    JobApplication.objects.bulk_update(applications, ['match_score'], batch_size=500)
+    return len(applications)
+
+
+def clear_job_scores(job):
+    """Invalidate every score for a job (its requirements changed)"""
+    job.applications.update(match_score=None)
+
+
+def clear_profile_scores(profile):
+    """Invalidate an applicant's scores (their profile changed)"""
+    profile.applications.update(match_score=None)
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:41
+
+import django.db.models.deletion
+import jobs.models
+from django.db import migrations, models
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_job_fts USING fts5("
+        "title, company, skills, location, description, "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    # Persist per-column BM25 weights so ORDER BY rank uses them
+    schema_editor.execute(
+        "INSERT INTO jobs_job_fts (jobs_job_fts, rank) "
+        "VALUES ('rank', 'bm25(10.0, 6.0, 4.0, 2.0, 1.0)')"
+    )
+    schema_editor.execute(
+        "INSERT INTO jobs_job_fts (rowid, title, company, skills, location, description) "
+        "SELECT j.id, j.title, c.company_name, j.required_skills || ' ' || j.preferred_skills, "
+        "j.location, j.description "
+        "FROM jobs_job j INNER JOIN accounts_employerprofile c ON c.id = j.company_id"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS jobs_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchIndex',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='jobs.job')),
+                ('title', models.TextField()),
+                ('company', models.TextField()),
+                ('skills', models.TextField()),
+                ('location', models.TextField()),
+                ('description', models.TextField()),
+                ('document', jobs.models.FullTextField(db_column='jobs_job_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'jobs_job_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
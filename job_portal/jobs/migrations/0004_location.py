@@ -0,0 +1,55 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('jobs', '0003_job_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Display name, e.g. San Francisco, CA', max_length=200)),
+                ('key', models.CharField(help_text='Normalized lookup key', max_length=200, unique=True)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('state', models.CharField(blank=True, max_length=100)),
+                ('country', models.CharField(blank=True, max_length=100)),
+                ('active_jobs_count', models.PositiveIntegerField(db_index=True, default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LocationAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text='Normalized alias key', max_length=200, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Location Aliases',
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='normalized_location',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='jobs.location'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['normalized_location', 'status'], name='job_location_status_idx'),
+        ),
+        migrations.AddField(
+            model_name='locationalias',
+            name='location',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='jobs.location'),
+        ),
+    ]
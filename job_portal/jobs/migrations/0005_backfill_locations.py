@@ -0,0 +1,51 @@
+from django.db import migrations
+from django.db.models import Count
+
+from jobs.locations import DEFAULT_ALIASES, normalize_key, parse_location
+
+
+def _get_location(Location, LocationAlias, text):
+    key = normalize_key(text)
+    if not key:
+        return None
+    alias = LocationAlias.objects.filter(alias=key).select_related('location').first()
+    if alias:
+        return alias.location
+    name, city, state, country = parse_location(text)
+    location, _ = Location.objects.get_or_create(
+        key=key,
+        defaults={'name': name, 'city': city, 'state': state, 'country': country}
+    )
+    return location
+
+
+def backfill_locations(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Location = apps.get_model('jobs', 'Location')
+    LocationAlias = apps.get_model('jobs', 'LocationAlias')
+
+    for alias, canonical in DEFAULT_ALIASES.items():
+        location = _get_location(Location, LocationAlias, canonical)
+        LocationAlias.objects.get_or_create(alias=normalize_key(alias), defaults={'location': location})
+
+    for text in Job.objects.order_by().values_list('location', flat=True).distinct():
+        location = _get_location(Location, LocationAlias, text)
+        if location:
+            Job.objects.filter(location=text).update(normalized_location=location)
+
+    counts = Job.objects.filter(status='active', normalized_location__isnull=False).order_by().values(
+        'normalized_location'
+    ).annotate(total=Count('id'))
+    for row in counts:
+        Location.objects.filter(pk=row['normalized_location']).update(active_jobs_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_location'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+from jobs.gazetteer import geocode, grid_cell
+
+
+def geocode_locations(apps, schema_editor):
+    Location = apps.get_model('jobs', 'Location')
+    for location in Location.objects.filter(latitude__isnull=True):
+        point = geocode(location.city, location.state, location.country) or geocode(location.name)
+        if point:
+            Location.objects.filter(pk=location.pk).update(
+                latitude=point[0], longitude=point[1], grid_cell=grid_cell(*point)
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_backfill_locations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='grid_cell',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(geocode_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+from django.db import migrations
+
+from jobs.skills import DEFAULT_SKILL_ALIASES, normalize_skill_key, split_skills
+
+
+def backfill_skills(apps, schema_editor):
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillAlias = apps.get_model('jobs', 'SkillAlias')
+    Job = apps.get_model('jobs', 'Job')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    ProfileSkill = apps.get_model('jobs', 'ProfileSkill')
+    JobSeekerProfile = apps.get_model('accounts', 'JobSeekerProfile')
+
+    skills_by_key = {}
+
+    def get_skill(name):
+        key = normalize_skill_key(name)
+        if key not in skills_by_key:
+            skill, _ = Skill.objects.get_or_create(key=key, defaults={'name': name})
+            skills_by_key[key] = skill
+        return skills_by_key[key]
+
+    for alias, canonical in DEFAULT_SKILL_ALIASES.items():
+        skill = get_skill(canonical)
+        key = normalize_skill_key(alias)
+        if key != skill.key:
+            SkillAlias.objects.get_or_create(alias=key, defaults={'skill': skill})
+    for alias in SkillAlias.objects.select_related('skill'):
+        skills_by_key[alias.alias] = alias.skill
+
+    job_skills = []
+    for job_id, required, preferred in Job.objects.values_list('id', 'required_skills', 'preferred_skills'):
+        wanted = {get_skill(name).pk: False for name in split_skills(preferred)}
+        wanted.update({get_skill(name).pk: True for name in split_skills(required)})
+        job_skills += [
+            JobSkill(job_id=job_id, skill_id=skill_id, is_required=is_required)
+            for skill_id, is_required in wanted.items()
+        ]
+    JobSkill.objects.bulk_create(job_skills, batch_size=500, ignore_conflicts=True)
+
+    profile_skills = []
+    for profile_id, skills in JobSeekerProfile.objects.exclude(skills='').values_list('id', 'skills'):
+        skill_ids = {get_skill(name).pk for name in split_skills(skills)}
+        profile_skills += [ProfileSkill(profile_id=profile_id, skill_id=skill_id) for skill_id in skill_ids]
+    ProfileSkill.objects.bulk_create(profile_skills, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_skill'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
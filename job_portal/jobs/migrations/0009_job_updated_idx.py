@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_coordinates'),
+        ('jobs', '0008_backfill_skills'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['updated_at'], name='job_updated_idx'),
+        ),
+    ]
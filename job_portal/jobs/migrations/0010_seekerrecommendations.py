@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_coordinates'),
+        ('jobs', '0009_job_updated_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeekerRecommendations',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='recommendations', serialize=False, to='accounts.jobseekerprofile')),
+                ('job_ids', models.JSONField(default=list)),
+                ('scores', models.JSONField(default=list)),
+                ('signature', models.CharField(blank=True, help_text='Hash of the profile fields the list was built from', max_length=32)),
+                ('generation', models.PositiveIntegerField(db_index=True, default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Seeker Recommendations',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_coordinates'),
+        ('jobs', '0010_seekerrecommendations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='match_score',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-match_score', '-id'], name='application_job_score_idx'),
+        ),
+    ]
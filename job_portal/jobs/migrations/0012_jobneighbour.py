@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_application_match_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='jobs.job')),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbour_of', to='jobs.job')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', '-score'], name='jobneighbour_job_score_idx')],
+                'unique_together': {('job', 'neighbour')},
+            },
+        ),
+    ]
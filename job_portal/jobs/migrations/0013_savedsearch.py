@@ -0,0 +1,67 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_coordinates'),
+        ('jobs', '0012_jobneighbour'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=200)),
+                ('query', models.JSONField(default=dict, help_text='job_list parameters the search was saved from')),
+                ('keywords', models.CharField(blank=True, max_length=200)),
+                ('location_ids', models.JSONField(blank=True, default=list, help_text='Matching Location ids (empty = anywhere)')),
+                ('has_location', models.BooleanField(default=False)),
+                ('job_type', models.CharField(blank=True, choices=[('full_time', 'Full Time'), ('part_time', 'Part Time'), ('contract', 'Contract'), ('internship', 'Internship'), ('freelance', 'Freelance')], max_length=20)),
+                ('experience_level', models.CharField(blank=True, choices=[('entry', 'Entry Level (0-1 years)'), ('junior', 'Junior (1-3 years)'), ('mid', 'Mid Level (3-5 years)'), ('senior', 'Senior (5-8 years)'), ('lead', 'Lead/Principal (8+ years)')], max_length=20)),
+                ('salary_min', models.PositiveIntegerField(blank=True, null=True)),
+                ('is_remote', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_alerted_at', models.DateTimeField(blank=True, null=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='jobs.jobcategory')),
+                ('skill', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='jobs.skill')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to='accounts.jobseekerprofile')),
+            ],
+            options={
+                'verbose_name_plural': 'Saved Searches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='jobs.job')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='jobs.savedsearch')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sent_at', 'saved_search'], name='jobalert_pending_idx')],
+                'unique_together': {('saved_search', 'job')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SavedSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=20)),
+                ('value', models.CharField(blank=True, max_length=100)),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='jobs.savedsearch')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['field', 'value'], name='savedsearchterm_lookup_idx')],
+                'unique_together': {('saved_search', 'field', 'value')},
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 19:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_savedsearch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('unique_viewers', models.PositiveIntegerField(default=0)),
+                ('saves', models.PositiveIntegerField(default=0)),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.job')),
+            ],
+            options={
+                'verbose_name_plural': 'Job Daily Stats',
+                'indexes': [models.Index(fields=['date', 'job'], name='jobdailystats_date_idx')],
+                'unique_together': {('job', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_stats(apps, schema_editor):
+    """Rebuild saves and applications per day from the raw tables (past views were never recorded)"""
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    SavedJob = apps.get_model('jobs', 'SavedJob')
+    JobDailyStats = apps.get_model('jobs', 'JobDailyStats')
+
+    rows = {}
+    sources = [
+        (JobApplication, 'applied_date', 'applications'),
+        (SavedJob, 'saved_date', 'saves'),
+    ]
+    for model, date_field, stat in sources:
+        counts = model.objects.annotate(day=TruncDate(date_field)).values('job_id', 'day').annotate(total=Count('id'))
+        for row in counts.order_by():
+            key = (row['job_id'], row['day'])
+            if key not in rows:
+                rows[key] = JobDailyStats(job_id=row['job_id'], date=row['day'])
+            setattr(rows[key], stat, row['total'])
+    JobDailyStats.objects.bulk_create(rows.values(), batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_jobdailystats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_backfill_daily_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobViewerSketch',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='viewer_sketch', serialize=False, to='jobs.job')),
+                ('sketch', models.BinaryField(default=bytes)),
+                ('unique_viewers', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobdailystats',
+            name='viewer_sketch',
+            field=models.BinaryField(default=bytes),
+        ),
+    ]
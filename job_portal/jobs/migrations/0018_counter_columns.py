@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_sitecounter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='saves_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobcategory',
+            name='active_jobs_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
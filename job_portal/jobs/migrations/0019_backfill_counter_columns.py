@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counter_columns(apps, schema_editor):
+    """Fill the new counter columns from the raw tables"""
+    Job = apps.get_model('jobs', 'Job')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    SavedJob = apps.get_model('jobs', 'SavedJob')
+    JobCategory = apps.get_model('jobs', 'JobCategory')
+    EmployerProfile = apps.get_model('accounts', 'EmployerProfile')
+
+    columns = [
+        (Job, 'applications_count', JobApplication.objects.all(), 'job'),
+        (Job, 'saves_count', SavedJob.objects.all(), 'job'),
+        (JobCategory, 'active_jobs_count', Job.objects.filter(status='active'), 'category'),
+        (EmployerProfile, 'active_jobs_count', Job.objects.filter(status='active'), 'company'),
+    ]
+    for model, field, counted, key in columns:
+        totals = counted.filter(**{key: OuterRef('pk')}).order_by().values(key).annotate(total=Count('pk')).values('total')
+        model.objects.update(**{field: Coalesce(Subquery(totals), Value(0))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_employer_active_jobs_count'),
+        ('jobs', '0018_counter_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counter_columns, migrations.RunPython.noop),
+    ]
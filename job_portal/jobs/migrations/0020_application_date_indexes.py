@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_date_joined_idx'),
+        ('jobs', '0019_backfill_counter_columns'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['updated_date'], name='application_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['applied_date'], name='application_applied_idx'),
+        ),
+    ]
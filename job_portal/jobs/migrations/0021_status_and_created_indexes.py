@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_date_joined_idx'),
+        ('jobs', '0020_application_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['created_at'], name='job_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['status'], name='application_status_idx'),
+        ),
+    ]
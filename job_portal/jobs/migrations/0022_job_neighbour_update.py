@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0021_status_and_created_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobNeighbourUpdate',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='neighbour_update', serialize=False, to='jobs.job')),
+                ('queued_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0022_job_neighbour_update'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='savedsearch',
+            name='salary_max',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
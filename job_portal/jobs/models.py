@@ -1,7 +1,14 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+from .counters import preserve_counters, view_counter
+from .gazetteer import bounding_box, cells_for_box, geocode, grid_cell, haversine_km
+from .locations import normalize_key, parse_location
+from .skills import normalize_skill_key, split_skills
+
 User = get_user_model()
 
 class JobCategory(models.Model):
@@ -9,11 +16,234 @@ class JobCategory(models.Model):
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # Maintained by jobs.signals (verify_counters repairs drift)
+    active_jobs_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    COUNTER_FIELDS = ('active_jobs_count',)
+    
     class Meta:
         verbose_name_plural = "Job Categories"
     
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        preserve_counters(self, self.COUNTER_FIELDS, kwargs)
+        super().save(*args, **kwargs)
+
+class LocationManager(models.Manager):
+    def resolve(self, text, create=True):
+        """Map free text (or a known alias) to a Location, creating it if needed"""
+        key = normalize_key(text)
+        if not key:
+            return None
+        
+        alias = LocationAlias.objects.select_related('location').filter(alias=key).first()
+        if alias:
+            return alias.location
+        
+        location = self.filter(key=key).first()
+        if location or not create:
+            return location
+        
+        name, city, state, country = parse_location(text)
+        location, _ = self.get_or_create(
+            key=key,
+            defaults={'name': name, 'city': city, 'state': state, 'country': country}
+        )
+        return location
+    
+    def match_ids(self, text):
+        """
+        Location ids for a search string: the exact/alias hit plus every location
+        whose key contains it (as the old icontains filter matched "Banani, Dhaka"
+        for "dhaka"); a scan of this small table
+        """
+        key = normalize_key(text)
+        if not key:
+            return []
+        ids = list(self.filter(key__contains=key).values_list('pk', flat=True))
+        location = self.resolve(text, create=False)
+        if location and location.pk not in ids:
+            ids.insert(0, location.pk)
+        return ids
+    
+    def within_radius(self, latitude, longitude, radius_km):
+        """Ids of locations within `radius_km` of a point: grid-cell/bounding-box prefilter, exact haversine after"""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        candidates = self.filter(
+            grid_cell__in=cells_for_box(min_lat, max_lat, min_lon, max_lon),
+            latitude__range=(min_lat, max_lat),
+        ).values_list('pk', 'latitude', 'longitude')
+        return [
+            pk for pk, lat, lon in candidates
+            if haversine_km(latitude, longitude, lat, lon) <= radius_km
+        ]
+    
+    def refresh_active_counts(self, location_ids):
+        """Recompute active_jobs_count for the given locations in one UPDATE"""
+        location_ids = [pk for pk in location_ids if pk]
+        if not location_ids:
+            return
+        active_jobs = Job.objects.filter(
+            normalized_location=OuterRef('pk'), status='active'
+        ).order_by().values('normalized_location').annotate(total=Count('id')).values('total')
+        self.filter(pk__in=location_ids).update(
+            active_jobs_count=Coalesce(Subquery(active_jobs), Value(0))
+        )
+
+class Location(models.Model):
+    """Normalized city/state/country that jobs point to"""
+    
+    name = models.CharField(max_length=200, help_text="Display name, e.g. San Francisco, CA")
+    key = models.CharField(max_length=200, unique=True, help_text="Normalized lookup key")
+    city = models.CharField(max_length=100, blank=True)
+    state = models.CharField(max_length=100, blank=True)
+    country = models.CharField(max_length=100, blank=True)
+    active_jobs_count = models.PositiveIntegerField(default=0, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Coordinates from the offline gazetteer (jobs/data/cities.csv)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    grid_cell = models.IntegerField(null=True, blank=True, db_index=True)
+    
+    objects = LocationManager()
+    
+    # Fields the coordinates are looked up from
+    GEOCODE_FIELDS = ('name', 'city', 'state', 'country')
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded values so save() can tell when the place was edited
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def get_loaded_value(self, attname):
+        """Value of `attname` when the row was loaded (None for new locations)"""
+        return getattr(self, '_loaded_values', {}).get(attname)
+    
+    def _changed(self, fields):
+        if not hasattr(self, '_loaded_values'):
+            return False
+        return any(self.get_loaded_value(field) != getattr(self, field) for field in fields)
+    
+    def geocode(self):
+        """Fill coordinates and grid cell from the gazetteer"""
+        point = geocode(self.city, self.state, self.country) or geocode(self.name)
+        if point:
+            self.latitude, self.longitude = point
+            self.grid_cell = grid_cell(*point)
+        else:
+            self.latitude = self.longitude = self.grid_cell = None
+    
+    def save(self, *args, **kwargs):
+        repositioned = self._changed(('latitude', 'longitude'))
+        if self.latitude is None or (self._changed(self.GEOCODE_FIELDS) and not repositioned):
+            # New or edited place: look the coordinates up again
+            self.geocode()
+        elif repositioned and self.longitude is not None:
+            # Coordinates set by hand: keep them, but index them in the right cell
+            self.grid_cell = grid_cell(self.latitude, self.longitude)
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'latitude', 'longitude', 'grid_cell'}
+        super().save(*args, **kwargs)
+        self._loaded_values = {field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields}
+
+class LocationAlias(models.Model):
+    """Alternative spelling that resolves to a Location, e.g. "SF" -> San Francisco, CA"""
+    
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=200, unique=True, help_text="Normalized alias key")
+    
+    class Meta:
+        verbose_name_plural = "Location Aliases"
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.location.name}"
+    
+    def save(self, *args, **kwargs):
+        self.alias = normalize_key(self.alias)
+        super().save(*args, **kwargs)
+
+class SkillManager(models.Manager):
+    def resolve_many(self, names, create=True):
+        """Map skill names (or aliases) to Skill rows, creating unknown ones; preserves order"""
+        keys = []
+        display = {}
+        for name in names:
+            key = normalize_skill_key(name)
+            if key and key not in display:
+                keys.append(key)
+                display[key] = name
+        if not keys:
+            return []
+        
+        by_key = {
+            alias.alias: alias.skill
+            for alias in SkillAlias.objects.select_related('skill').filter(alias__in=keys)
+        }
+        missing = [key for key in keys if key not in by_key]
+        if missing:
+            for skill in self.filter(key__in=missing):
+                by_key[skill.key] = skill
+            new_keys = [key for key in missing if key not in by_key]
+            if new_keys and create:
+                self.bulk_create(
+                    [Skill(name=display[key], key=key) for key in new_keys],
+                    ignore_conflicts=True
+                )
+                for skill in self.filter(key__in=new_keys):
+                    by_key[skill.key] = skill
+        
+        skills = []
+        for key in keys:
+            skill = by_key.get(key)
+            if skill and skill not in skills:
+                skills.append(skill)
+        return skills
+
+class Skill(models.Model):
+    """Canonical skill shared by job requirements and seeker profiles"""
+    
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True, help_text="Normalized lookup key")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = SkillManager()
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+    
+    def save(self, *args, **kwargs):
+        self.key = normalize_skill_key(self.key or self.name)
+        super().save(*args, **kwargs)
+
+class SkillAlias(models.Model):
+    """Alternative spelling that resolves to a Skill, e.g. "JS" -> JavaScript"""
+    
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100, unique=True, help_text="Normalized alias key")
+    
+    class Meta:
+        verbose_name_plural = "Skill Aliases"
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+    
+    def save(self, *args, **kwargs):
+        self.alias = normalize_skill_key(self.alias)
+        super().save(*args, **kwargs)
 
 class Job(models.Model):
     JOB_TYPE_CHOICES = [
@@ -55,6 +285,10 @@ class Job(models.Model):
     
     # Location and Salary
     location = models.CharField(max_length=200)
+    normalized_location = models.ForeignKey(
+        Location, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='jobs', editable=False
+    )
     is_remote = models.BooleanField(default=False)
     salary_min = models.PositiveIntegerField(null=True, blank=True, help_text="Minimum salary")
     salary_max = models.PositiveIntegerField(null=True, blank=True, help_text="Maximum salary")
@@ -63,6 +297,7 @@ class Job(models.Model):
     # Skills and Tags
     required_skills = models.TextField(blank=True, help_text="Comma-separated required skills")
     preferred_skills = models.TextField(blank=True, help_text="Comma-separated preferred skills")
+    skills = models.ManyToManyField(Skill, through='JobSkill', related_name='jobs', blank=True)
     
     # Status and Dates
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
@@ -73,24 +308,79 @@ class Job(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     views_count = models.PositiveIntegerField(default=0)
     
+    # Maintained by jobs.signals (verify_counters repairs drift)
+    applications_count = models.PositiveIntegerField(default=0, editable=False)
+    saves_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    COUNTER_FIELDS = ('views_count', 'applications_count', 'saves_count')
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='job_status_created_idx'),
+            models.Index(fields=['status', 'category'], name='job_status_category_idx'),
+            models.Index(fields=['status', 'job_type'], name='job_status_type_idx'),
+            models.Index(fields=['status', 'experience_level'], name='job_status_experience_idx'),
+            models.Index(fields=['status', 'is_remote'], name='job_status_remote_idx'),
+            models.Index(fields=['normalized_location', 'status'], name='job_location_status_idx'),
+            models.Index(fields=['updated_at'], name='job_updated_idx'),
+            models.Index(fields=['created_at'], name='job_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} at {self.company.company_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded values so saves and signals can tell what changed
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def get_loaded_value(self, attname):
+        """Value of `attname` when the row was loaded (None for new jobs)"""
+        return getattr(self, '_loaded_values', {}).get(attname)
+    
+    def save(self, *args, **kwargs):
+        preserve_counters(self, self.COUNTER_FIELDS, kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'location' in update_fields:
+            # Keep the normalized location in step with the free-text field
+            if self.normalized_location_id is None or self.get_loaded_value('location') != self.location:
+                self.normalized_location = Location.objects.resolve(self.location)
+                if update_fields is not None:
+                    kwargs['update_fields'] = set(update_fields) | {'normalized_location'}
+        
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
+    
     def get_absolute_url(self):
         return reverse('jobs:job_detail', kwargs={'pk': self.pk})
     
     def get_required_skills_list(self):
-        if self.required_skills:
-            return [skill.strip() for skill in self.required_skills.split(',')]
-        return []
+        return list(split_skills(self.required_skills))
     
     def get_preferred_skills_list(self):
-        if self.preferred_skills:
-            return [skill.strip() for skill in self.preferred_skills.split(',')]
-        return []
+        return list(split_skills(self.preferred_skills))
+    
+    def sync_skills(self):
+        """Rebuild the JobSkill rows from the comma-separated skill fields"""
+        required = Skill.objects.resolve_many(split_skills(self.required_skills))
+        preferred = Skill.objects.resolve_many(split_skills(self.preferred_skills))
+        wanted = {skill.pk: False for skill in preferred}
+        wanted.update({skill.pk: True for skill in required})
+        
+        existing = dict(self.job_skills.values_list('skill_id', 'is_required'))
+        if existing == wanted:
+            return
+        self.job_skills.all().delete()
+        JobSkill.objects.bulk_create([
+            JobSkill(job=self, skill_id=skill_id, is_required=is_required)
+            for skill_id, is_required in wanted.items()
+        ])
     
     def get_salary_range(self):
         if self.salary_min and self.salary_max:
@@ -99,9 +389,15 @@ class Job(models.Model):
             return f"{self.salary_currency} {self.salary_min:,}+"
         return "Salary not specified"
     
-    def increment_views(self):
+    def increment_views(self, viewer=None):
+        """Count a view (and its viewer for unique counts); buffered and written in batches by jobs.counters"""
+        view_counter.add(self.pk, viewer=viewer)
         self.views_count += 1
-        self.save(update_fields=['views_count'])
+    
+    @property
+    def live_views_count(self):
+        """views_count including views this process hasn't written yet"""
+        return self.views_count + view_counter.pending_for(self.pk)
 
 class JobApplication(models.Model):
     STATUS_CHOICES = [
@@ -128,9 +424,18 @@ class JobApplication(models.Model):
     # Employer Notes
     employer_notes = models.TextField(blank=True, help_text="Internal notes for employer")
     
+    # Fit against the job's requirements (0-100), filled in bulk by jobs.matching
+    match_score = models.FloatField(null=True, blank=True, editable=False)
+    
     class Meta:
         unique_together = ['job', 'applicant']
         ordering = ['-applied_date']
+        indexes = [
+            models.Index(fields=['job', '-match_score', '-id'], name='application_job_score_idx'),
+            models.Index(fields=['updated_date'], name='application_updated_idx'),
+            models.Index(fields=['applied_date'], name='application_applied_idx'),
+            models.Index(fields=['status'], name='application_status_idx'),
+        ]
     
     def __str__(self):
         return f"{self.applicant.user.username} applied for {self.job.title}"
@@ -145,4 +450,312 @@ class SavedJob(models.Model):
         ordering = ['-saved_date']
     
     def __str__(self):
-        return f"{self.user.user.username} saved {self.job.title}"
\ No newline at end of file
+        return f"{self.user.user.username} saved {self.job.title}"
+
+class FullTextField(models.TextField):
+    """Hidden FTS5 column that carries the table name, used as the MATCH target"""
+
+@FullTextField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = 'match'
+    
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+class JobSearchIndex(models.Model):
+    """SQLite FTS5 shadow table over Job, maintained by jobs.search"""
+    
+    job = models.OneToOneField(
+        Job, on_delete=models.DO_NOTHING, primary_key=True,
+        db_column='rowid', related_name='search_index'
+    )
+    title = models.TextField()
+    company = models.TextField()
+    skills = models.TextField()
+    location = models.TextField()
+    description = models.TextField()
+    
+    # FTS5 hidden columns
+    document = FullTextField(db_column='jobs_job_fts')
+    rank = models.FloatField()
+    
+    class Meta:
+        managed = False
+        db_table = 'jobs_job_fts'
+    
+    def __str__(self):
+        return self.title
+
+class JobSkill(models.Model):
+    """Required/preferred skill of a job (normalized from Job.required_skills/preferred_skills)"""
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_skills')
+    is_required = models.BooleanField(default=True)
+    
+    class Meta:
+        unique_together = ['job', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'is_required', 'job'], name='jobskill_skill_job_idx'),
+        ]
+    
+    def __str__(self):
+        kind = 'required' if self.is_required else 'preferred'
+        return f"{self.job.title}: {self.skill.name} ({kind})"
+
+class ProfileSkill(models.Model):
+    """Skill listed on a job seeker profile (normalized from JobSeekerProfile.skills)"""
+    
+    profile = models.ForeignKey('accounts.JobSeekerProfile', on_delete=models.CASCADE, related_name='profile_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='profile_skills')
+    
+    class Meta:
+        unique_together = ['profile', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'profile'], name='profileskill_skill_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.profile}: {self.skill.name}"
+
+class SeekerRecommendations(models.Model):
+    """Precomputed top-N recommended job ids for a job seeker (see jobs.recommendations)"""
+
+    profile = models.OneToOneField(
+        'accounts.JobSeekerProfile', on_delete=models.CASCADE,
+        primary_key=True, related_name='recommendations'
+    )
+    job_ids = models.JSONField(default=list)
+    scores = models.JSONField(default=list)
+    signature = models.CharField(max_length=32, blank=True, help_text="Hash of the profile fields the list was built from")
+    generation = models.PositiveIntegerField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Seeker Recommendations"
+
+    def __str__(self):
+        return f"{self.profile}: {len(self.job_ids)} jobs (generation {self.generation})"
+
+class JobNeighbour(models.Model):
+    """Precomputed "similar job" of an active job (see jobs.similarity)"""
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='neighbours')
+    neighbour = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='neighbour_of')
+    score = models.FloatField()
+    
+    class Meta:
+        unique_together = ['job', 'neighbour']
+        indexes = [
+            models.Index(fields=['job', '-score'], name='jobneighbour_job_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} ~ {self.neighbour_id} ({self.score:.3f})"
+
+class JobNeighbourUpdate(models.Model):
+    """Job whose similar-jobs lists are out of date, queued for build_similar_jobs --pending"""
+    
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='neighbour_update')
+    queued_at = models.DateTimeField(auto_now=True, db_index=True)
+    
+    def __str__(self):
+        return f"{self.job_id} queued {self.queued_at:%Y-%m-%d %H:%M}"
+
+class SavedSearch(models.Model):
+    """A job_list filter set a seeker wants alerts for (matched against new jobs by jobs.alerts)"""
+    
+    user = models.ForeignKey('accounts.JobSeekerProfile', on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=200, blank=True)
+    query = models.JSONField(default=dict, help_text="job_list parameters the search was saved from")
+    
+    # Normalized criteria
+    keywords = models.CharField(max_length=200, blank=True)
+    category = models.ForeignKey(JobCategory, on_delete=models.CASCADE, null=True, blank=True)
+    location_ids = models.JSONField(default=list, blank=True, help_text="Matching Location ids (empty = anywhere)")
+    has_location = models.BooleanField(default=False)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, null=True, blank=True)
+    job_type = models.CharField(max_length=20, choices=Job.JOB_TYPE_CHOICES, blank=True)
+    experience_level = models.CharField(max_length=20, choices=Job.EXPERIENCE_CHOICES, blank=True)
+    salary_min = models.PositiveIntegerField(null=True, blank=True)
+    salary_max = models.PositiveIntegerField(null=True, blank=True)
+    is_remote = models.BooleanField(default=False)
+    
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_alerted_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name_plural = "Saved Searches"
+    
+    def __str__(self):
+        return self.name or f"Saved search #{self.pk}"
+
+class SavedSearchTerm(models.Model):
+    """Reverse-index entry: the term a saved search is found under when a job is published"""
+    
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='terms')
+    field = models.CharField(max_length=20)
+    value = models.CharField(max_length=100, blank=True)
+    
+    class Meta:
+        unique_together = ['saved_search', 'field', 'value']
+        indexes = [
+            models.Index(fields=['field', 'value'], name='savedsearchterm_lookup_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.field}={self.value}"
+
+class JobAlert(models.Model):
+    """Queued notification that a job matched a saved search"""
+    
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='alerts')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='alerts')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ['saved_search', 'job']
+        indexes = [
+            models.Index(fields=['sent_at', 'saved_search'], name='jobalert_pending_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.saved_search}: {self.job.title}"
+
+class JobDailyStats(models.Model):
+    """Per-job, per-day activity rollup, incremented as events happen (see jobs.stats)"""
+    
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    unique_viewers = models.PositiveIntegerField(default=0)
+    saves = models.PositiveIntegerField(default=0)
+    applications = models.PositiveIntegerField(default=0)
+    
+    # HyperLogLog sketch of the day's viewers (jobs.hll); unique_viewers is its estimate
+    viewer_sketch = models.BinaryField(default=bytes, editable=False)
+    
+    class Meta:
+        unique_together = ['job', 'date']
+        verbose_name_plural = "Job Daily Stats"
+        indexes = [
+            models.Index(fields=['date', 'job'], name='jobdailystats_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} on {self.date}: {self.views} views, {self.applications} applications"
+
+class JobViewerSketch(models.Model):
+    """All-time HyperLogLog sketch of a job's viewers (merge of its daily sketches)"""
+    
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='viewer_sketch')
+    sketch = models.BinaryField(default=bytes, editable=False)
+    unique_viewers = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.job_id}: ~{self.unique_viewers} unique viewers"
+
+class SiteCounterManager(models.Manager):
+    def expected(self):
+        """The true value of every counter, counted from scratch: {key: (category_id, value)}"""
+        from accounts.models import EmployerProfile
+        
+        values = {
+            SiteCounter.ACTIVE_JOBS: (None, Job.objects.filter(status='active').count()),
+            SiteCounter.COMPANIES: (None, EmployerProfile.objects.count()),
+            SiteCounter.JOB_SEEKERS: (None, User.objects.filter(user_type='job_seeker').count()),
+        }
+        categories = JobCategory.objects.annotate(
+            active=Count('job', filter=models.Q(job__status='active'))
+        ).values_list('pk', 'active')
+        for category_id, active in categories:
+            values[SiteCounter.category_key(category_id)] = (category_id, active)
+        return values
+    
+    def apply(self, deltas):
+        """Add {key: delta} to the counters; a missing row is created from a fresh count"""
+        for key, delta in deltas.items():
+            if not delta:
+                continue
+            if self.filter(key=key).update(value=models.F('value') + delta):
+                continue
+            # First use of this counter (new category or empty table): seed it from the source
+            category_id, value = self.expected().get(key, (None, 0))
+            self.get_or_create(key=key, defaults={'category_id': category_id, 'value': value})
+    
+    def reconcile(self):
+        """Recount everything and repair drifted or missing rows; returns the number repaired"""
+        expected = self.expected()
+        stored = {counter.key: counter for counter in self.all()}
+        repaired = 0
+        for key, (category_id, value) in expected.items():
+            counter = stored.pop(key, None)
+            if counter is None:
+                self.create(key=key, category_id=category_id, value=value)
+                repaired += 1
+            elif counter.value != value:
+                # Compare-and-set so increments made during the recount aren't overwritten
+                repaired += self.filter(pk=counter.pk, value=counter.value).update(value=value)
+        if stored:
+            repaired += self.filter(pk__in=[counter.pk for counter in stored.values()]).delete()[0]
+        return repaired
+    
+    def snapshot(self, categories=8):
+        """Headline numbers and the busiest categories, in one query"""
+        counters = list(self.select_related('category'))
+        totals = {counter.key: counter.value for counter in counters if counter.category_id is None}
+        if len(totals) < len(SiteCounter.HEADLINE):
+            # Unseeded table (fresh install): count once, then serve from the rows
+            self.reconcile()
+            return self.snapshot(categories)
+        popular = []
+        for counter in sorted(counters, key=lambda counter: -counter.value):
+            if counter.category_id is not None and counter.value > 0:
+                counter.category.job_count = counter.value
+                popular.append(counter.category)
+        return totals, popular[:categories]
+
+class SiteCounter(models.Model):
+    """
+    Denormalized site-wide counts for the homepage.
+    
+    Kept current by jobs.signals and repaired by the reconcile_site_counters
+    command; per-category rows carry the category's active job count.
+    """
+    
+    ACTIVE_JOBS = 'active_jobs'
+    COMPANIES = 'companies'
+    JOB_SEEKERS = 'job_seekers'
+    HEADLINE = (ACTIVE_JOBS, COMPANIES, JOB_SEEKERS)
+    
+    key = models.CharField(max_length=50, unique=True)
+    category = models.OneToOneField(
+        JobCategory, on_delete=models.CASCADE, null=True, blank=True, related_name='site_counter'
+    )
+    value = models.IntegerField(default=0)
+    
+    objects = SiteCounterManager()
+    
+    def __str__(self):
+        return f"{self.key}: {self.value}"
+    
+    @staticmethod
+    def category_key(category_id):
+        return f'category:{category_id}'
+
+def sync_profile_skills(profile):
+    """Rebuild the ProfileSkill rows from JobSeekerProfile.skills"""
+    wanted = {skill.pk for skill in Skill.objects.resolve_many(split_skills(profile.skills))}
+    existing = set(profile.profile_skills.values_list('skill_id', flat=True))
+    if existing == wanted:
+        return
+    profile.profile_skills.exclude(skill_id__in=wanted).delete()
+    ProfileSkill.objects.bulk_create(
+        [ProfileSkill(profile=profile, skill_id=skill_id) for skill_id in wanted - existing],
+        ignore_conflicts=True
+    )
@@ -0,0 +1,144 @@
+# jobs/pagecache.py - Full-page cache for anonymous visitors with tag-based invalidation
+
+import hashlib
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+# How long a rendered page is kept server-side (tags normally invalidate it sooner)
+PAGE_CACHE_SECONDS = getattr(settings, 'PAGE_CACHE_SECONDS', 300)
+
+# How long browsers and proxies may reuse a page without revalidating
+PAGE_CACHE_MAX_AGE = getattr(settings, 'PAGE_CACHE_MAX_AGE', 60)
+
+# Query parameters that never change the page
+IGNORED_PARAMETERS = {'fbclid', 'gclid', 'ref'}
+
+# Tag of every page listing jobs (home, job_list)
+LISTINGS = 'listings'
+
+
+def job_tag(job_id):
+    return f'job:{job_id}'
+
+
+def company_tag(company_id):
+    return f'company:{company_id}'
+
+
+def category_tag(category_id):
+    return f'category:{category_id}'
+
+
+def _tag_key(tag):
+    return f'pagecache:tag:{tag}'
+
+
+def _new_version():
+    return time.time_ns()
+
+
+def invalidate(*tags):
+    """Expire every cached page carrying one of `tags`"""
+    version = _new_version()
+    cache.set_many({_tag_key(tag): version for tag in tags}, None)
+
+
+def _tag_versions(tags):
+    """Current version of each tag, creating versions for tags not seen before"""
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys))
+    for key, tag in keys.items():
+        if key not in found:
+            cache.add(key, _new_version(), None)
+            found[key] = cache.get(key)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def add_tags(request, *tags):
+    """Record what the page being rendered depends on; used when it is cached"""
+    request.page_cache_tags = getattr(request, 'page_cache_tags', set()) | set(tags)
+
+
+def page_key(request):
+    """Cache key from the host, path and a normalized query string (sorted, blanks and tracking dropped)"""
+    params = sorted(
+        (name, value)
+        for name, values in request.GET.lists()
+        for value in values
+        if value.strip() and name not in IGNORED_PARAMETERS and not name.startswith('utm_')
+    )
+    raw = f'{request.scheme}://{request.get_host()}{request.path}?{urlencode(params)}'
+    return 'pagecache:page:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def _cacheable(request):
+    if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+        return False
+    # Pages carrying one-off flash messages are not shared
+    return not request.COOKIES.get('messages') and not request.session.get('_messages')
+
+
+def _finish(request, response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=PAGE_CACHE_MAX_AGE)
+    # Logged-in visitors get personalized pages at the same URLs
+    patch_vary_headers(response, ['Cookie'])
+    return get_conditional_response(request, etag=etag, last_modified=last_modified, response=response)
+
+
+def cache_anonymous_page(tags=(LISTINGS,), on_hit=None):
+    """
+    Serve anonymous GETs from the cache.
+
+    A page is stored with the versions of the tags it depends on: `tags` plus
+    any the view adds with add_tags(). It is a hit only while none of them has
+    been invalidated, so model changes expire exactly the pages that show them.
+    `on_hit(request, *args, **kwargs)` runs on hits for side effects the skipped
+    view would have had (e.g. counting a view).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _cacheable(request):
+                return view(request, *args, **kwargs)
+
+            key = page_key(request)
+            entry = cache.get(key)
+            if entry and _tag_versions(entry['tags']) == entry['tags']:
+                if on_hit:
+                    on_hit(request, *args, **kwargs)
+                response = HttpResponse(entry['content'], content_type=entry['content_type'])
+                return _finish(request, response, entry['etag'], entry['last_modified'])
+
+            # Versions are read before rendering so a change made meanwhile expires the entry
+            add_tags(request, *tags)
+            versions = _tag_versions(request.page_cache_tags)
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming or response.cookies:
+                return response
+            # Tags the view added while rendering
+            versions.update({
+                tag: version for tag, version in _tag_versions(request.page_cache_tags).items()
+                if tag not in versions
+            })
+
+            etag = '"%s"' % hashlib.md5(response.content).hexdigest()
+            last_modified = int(time.time())
+            cache.set(key, {
+                'content': response.content,
+                'content_type': response['Content-Type'],
+                'etag': etag,
+                'last_modified': last_modified,
+                'tags': versions,
+            }, PAGE_CACHE_SECONDS)
+            return _finish(request, response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -0,0 +1,206 @@
+# jobs/pagination.py - Keyset (cursor) pagination for listing views
+
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+
+
+def encode_cursor(values, direction):
+    """Pack key values into an opaque, URL-safe token"""
+    payload = [direction] + [
+        {'dt': value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    # Other non-JSON keys (dates, decimals) travel as strings; CursorPaginator converts them back
+    data = json.dumps(payload, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Return (values, direction) or (None, None) for a missing/invalid token"""
+    if not token:
+        return None, None
+    try:
+        data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, *values = json.loads(data)
+        values = [
+            parse_datetime(value['dt']) if isinstance(value, dict) else value
+            for value in values
+        ]
+    except (ValueError, TypeError, KeyError):
+        return None, None
+    if direction not in ('next', 'prev'):
+        return None, None
+    return values, direction
+
+
+class CursorPage:
+    """One page of a CursorPaginator; iterable like a django Page"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return ''
+        return encode_cursor(self.paginator.key_values(self.object_list[-1]), 'next')
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return ''
+        return encode_cursor(self.paginator.key_values(self.object_list[0]), 'prev')
+
+
+class CursorPaginator:
+    """
+    Paginate a queryset by seeking past the last seen key instead of OFFSET.
+
+    `ordering` must end in a unique field (normally '-id') so every row has a
+    distinct position; e.g. ('-created_at', '-id'). NULLs in nullable key
+    columns sort last in page order on every backend.
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id'), count_timeout=60):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+        self.count_timeout = count_timeout
+        self.fields = [(key.lstrip('-'), key.startswith('-')) for key in self.ordering]
+        self.columns = [self._column(name) for name, _ in self.fields]
+
+    def _column(self, name):
+        """The model field or annotation output field a key is read from"""
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return self.queryset.model._meta.get_field(name)
+
+    def key_values(self, obj):
+        return [getattr(obj, name) for name, _ in self.fields]
+
+    def clean_values(self, values):
+        """
+        Cursor values converted to the key columns' types, or None if the
+        cursor doesn't fit this ordering (wrong length, bad values, or NULL
+        for a column that can't hold one).
+        """
+        if values is None or len(values) != len(self.fields):
+            return None
+        cleaned = []
+        for value, column in zip(values, self.columns):
+            if value is None:
+                if not column.null:
+                    return None
+                cleaned.append(None)
+                continue
+            if isinstance(value, (dict, list)):
+                return None
+            try:
+                cleaned.append(column.to_python(value))
+            except (ValidationError, TypeError, ValueError):
+                return None
+        return cleaned
+
+    def _order_by(self, forward):
+        """Page order (forward) or its exact reverse, with NULLs pinned for nullable keys"""
+        ordering = []
+        for (name, descending), column in zip(self.fields, self.columns):
+            descending = descending == forward
+            if column.null:
+                # NULLs last in page order, so first when reading backwards
+                expression = F(name).desc if descending else F(name).asc
+                ordering.append(expression(nulls_last=True) if forward else expression(nulls_first=True))
+            else:
+                ordering.append(f'-{name}' if descending else name)
+        return ordering
+
+    def _seek_filter(self, values, forward):
+        """Rows strictly after (forward) or before `values` in page order"""
+        condition = Q()
+        for i, ((name, descending), column) in enumerate(zip(self.fields, self.columns)):
+            value = values[i]
+            if value is None:
+                # NULLs come last: nothing follows them, every non-NULL precedes them
+                if forward:
+                    continue
+                clause = Q(**{f'{name}__isnull': False})
+            else:
+                after = descending == forward
+                clause = Q(**{f'{name}__{"lt" if after else "gt"}': value})
+                if forward and column.null:
+                    clause |= Q(**{f'{name}__isnull': True})
+            for j, (prev_name, _) in enumerate(self.fields[:i]):
+                if values[j] is None:
+                    clause &= Q(**{f'{prev_name}__isnull': True})
+                else:
+                    clause &= Q(**{prev_name: values[j]})
+            condition |= clause
+        return condition
+
+    def get_page(self, cursor=None):
+        values, direction = decode_cursor(cursor)
+        values = self.clean_values(values)
+        if values is None:
+            # Missing, tampered or stale cursors start from the first page
+            direction = None
+
+        queryset = self.queryset
+        if direction == 'prev':
+            queryset = queryset.filter(self._seek_filter(values, forward=False)).order_by(*self._order_by(False))
+        else:
+            if direction == 'next':
+                queryset = queryset.filter(self._seek_filter(values, forward=True))
+            queryset = queryset.order_by(*self._order_by(True))
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == 'prev':
+            rows.reverse()
+            return CursorPage(rows, self, has_next=True, has_previous=has_more)
+        return CursorPage(rows, self, has_next=has_more, has_previous=direction == 'next')
+
+    @property
+    def count(self):
+        """Total rows, cached per filter set so listing headers don't rescan"""
+        try:
+            sql, params = self.queryset.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        digest = hashlib.md5(f'{sql}|{params}'.encode()).hexdigest()
+        cache_key = f'cursor-count:{digest}'
+        total = cache.get(cache_key)
+        if total is None:
+            total = self.queryset.order_by().count()
+            cache.set(cache_key, total, self.count_timeout)
+        return total
@@ -0,0 +1,364 @@
+# jobs/recommendations.py - Sparse-vector job recommender for job seekers
+
+import hashlib
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+from django.db.models import Max
+
+from .models import Job, JobApplication, JobSkill, Location, ProfileSkill, SeekerRecommendations
+
+# Column layout of the feature space. Skill and location ids are folded into
+# fixed-size buckets so columns stay stable while the catalogues grow.
+EXPERIENCE_LEVELS = [value for value, _ in Job.EXPERIENCE_CHOICES]
+JOB_TYPES = [value for value, _ in Job.JOB_TYPE_CHOICES]
+SALARY_BANDS = [0, 20000, 40000, 60000, 80000, 100000, 130000, 160000, 200000]
+
+EXPERIENCE_OFFSET = 0
+JOB_TYPE_OFFSET = EXPERIENCE_OFFSET + len(EXPERIENCE_LEVELS)
+SALARY_OFFSET = JOB_TYPE_OFFSET + len(JOB_TYPES)
+REMOTE_COLUMN = SALARY_OFFSET + len(SALARY_BANDS)
+SKILL_OFFSET = REMOTE_COLUMN + 1
+SKILL_BUCKETS = 1 << 16
+LOCATION_OFFSET = SKILL_OFFSET + SKILL_BUCKETS
+LOCATION_BUCKETS = 1 << 14
+N_FEATURES = LOCATION_OFFSET + LOCATION_BUCKETS
+
+# Relative importance of each feature group in the final score
+WEIGHTS = {
+    'skill': 3.0,
+    'experience': 1.0,
+    'job_type': 1.0,
+    'salary': 0.5,
+    'location': 1.5,
+    'remote': 1.0,
+}
+PREFERRED_SKILL_FACTOR = 0.5
+
+# Rebuild the whole matrix at least this often (catches deletes made by other processes)
+FULL_REBUILD_SECONDS = 600
+
+
+def _salary_columns(low, high):
+    """Salary band columns overlapped by [low, high]"""
+    if low is None and high is None:
+        return []
+    low = low if low is not None else high
+    high = high if high is not None else low
+    columns = []
+    for i, start in enumerate(SALARY_BANDS):
+        end = SALARY_BANDS[i + 1] if i + 1 < len(SALARY_BANDS) else float('inf')
+        if low < end and high >= start:
+            columns.append(SALARY_OFFSET + i)
+    return columns
+
+
+def _experience_entries(level, weight):
+    """One-hot experience level, with half weight on the neighbouring levels"""
+    if level not in EXPERIENCE_LEVELS:
+        return []
+    index = EXPERIENCE_LEVELS.index(level)
+    entries = [(EXPERIENCE_OFFSET + index, weight)]
+    for neighbour in (index - 1, index + 1):
+        if 0 <= neighbour < len(EXPERIENCE_LEVELS):
+            entries.append((EXPERIENCE_OFFSET + neighbour, weight * 0.5))
+    return entries
+
+
+def job_entries(job, skills):
+    """(column, value) pairs for a job; `skills` is a list of (skill_id, is_required)"""
+    entries = []
+    if skills:
+        scale = WEIGHTS['skill'] / np.sqrt(len(skills))
+        for skill_id, is_required in skills:
+            value = scale if is_required else scale * PREFERRED_SKILL_FACTOR
+            entries.append((SKILL_OFFSET + skill_id % SKILL_BUCKETS, value))
+    if job.experience_level in EXPERIENCE_LEVELS:
+        entries.append((EXPERIENCE_OFFSET + EXPERIENCE_LEVELS.index(job.experience_level), WEIGHTS['experience']))
+    if job.job_type in JOB_TYPES:
+        entries.append((JOB_TYPE_OFFSET + JOB_TYPES.index(job.job_type), WEIGHTS['job_type']))
+    entries += [(column, WEIGHTS['salary']) for column in _salary_columns(job.salary_min, job.salary_max)]
+    if job.normalized_location_id:
+        entries.append((LOCATION_OFFSET + job.normalized_location_id % LOCATION_BUCKETS, WEIGHTS['location']))
+    if job.is_remote:
+        entries.append((REMOTE_COLUMN, WEIGHTS['remote']))
+    return entries
+
+
+def profile_entries(profile, skill_ids, location_ids):
+    """(column, value) pairs for a JobSeekerProfile with pre-resolved skill and location ids"""
+    entries = [(SKILL_OFFSET + skill_id % SKILL_BUCKETS, 1.0) for skill_id in skill_ids]
+    entries += _experience_entries(profile.experience_level, 1.0)
+
+    desired_types = {
+        '_'.join(job_type.lower().replace('-', ' ').split())
+        for job_type in profile.get_desired_job_types_list()
+    }
+    entries += [(JOB_TYPE_OFFSET + JOB_TYPES.index(job_type), 1.0) for job_type in desired_types & set(JOB_TYPES)]
+    entries += [(column, 1.0) for column in _salary_columns(profile.desired_salary_min, profile.desired_salary_max)]
+    entries += [(LOCATION_OFFSET + location_id % LOCATION_BUCKETS, 1.0) for location_id in location_ids]
+
+    if profile.open_to_remote or 'remote' in desired_types:
+        entries.append((REMOTE_COLUMN, 1.0))
+    return entries
+
+
+def build_csr(rows, n_features=N_FEATURES):
+    """CSR matrix from per-row (column, value) lists; duplicate columns keep the largest value"""
+    data, indices, indptr = [], [], [0]
+    for entries in rows:
+        merged = {}
+        for column, value in entries:
+            merged[column] = max(merged.get(column, 0.0), value)
+        indices.extend(merged.keys())
+        data.extend(merged.values())
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr)),
+        shape=(len(rows), n_features)
+    )
+
+
+def profile_matrix(profiles):
+    """CSR matrix with one row per profile, using one query for skills and one lookup per distinct location"""
+    skills = {}
+    for profile_id, skill_id in ProfileSkill.objects.filter(
+        profile__in=[profile.pk for profile in profiles]
+    ).values_list('profile_id', 'skill_id'):
+        skills.setdefault(profile_id, []).append(skill_id)
+
+    locations = {}
+    rows = []
+    for profile in profiles:
+        location_ids = []
+        for name in profile.get_preferred_locations_list():
+            if name not in locations:
+                location = Location.objects.resolve(name, create=False)
+                locations[name] = location.pk if location else None
+            if locations[name]:
+                location_ids.append(locations[name])
+        rows.append(profile_entries(profile, skills.get(profile.pk, []), location_ids))
+    return build_csr(rows)
+
+
+class JobMatrix:
+    """
+    Per-process CSR matrix with one row per active job.
+
+    Rows are refreshed incrementally from Job.updated_at; deletes seen by this
+    process are applied straight away and a periodic full rebuild catches the rest.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.matrix = sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self.job_ids = np.zeros(0, dtype=np.int64)
+        self.watermark = None
+        self.built_at = 0.0
+        self.removed = set()
+
+    def build_rows(self, jobs):
+        """CSR rows and id array for a list of jobs"""
+        skills = {}
+        for job_id, skill_id, is_required in JobSkill.objects.filter(
+            job__in=[job.pk for job in jobs]
+        ).values_list('job_id', 'skill_id', 'is_required'):
+            skills.setdefault(job_id, []).append((skill_id, is_required))
+
+        rows = build_csr([job_entries(job, skills.get(job.pk, [])) for job in jobs])
+        return rows, np.array([job.pk for job in jobs], dtype=np.int64)
+
+    def _fetch(self, queryset):
+        return list(queryset.only(
+            'experience_level', 'job_type', 'salary_min', 'salary_max',
+            'normalized_location', 'is_remote', 'status', 'updated_at'
+        ))
+
+    def rebuild(self):
+        jobs = self._fetch(Job.objects.filter(status='active'))
+        self.matrix, self.job_ids = self.build_rows(jobs)
+        self.watermark = max((job.updated_at for job in jobs), default=None)
+        self.built_at = time.monotonic()
+        self.removed.clear()
+
+    def update(self):
+        """Apply jobs changed since the last refresh"""
+        changed = Job.objects.all()
+        if self.watermark is not None:
+            changed = changed.filter(updated_at__gte=self.watermark)
+        jobs = self._fetch(changed)
+
+        stale = {job.pk for job in jobs} | self.removed
+        if not stale:
+            return
+        keep = ~np.isin(self.job_ids, list(stale))
+        active = [job for job in jobs if job.status == 'active']
+        rows, ids = self.build_rows(active)
+        self.matrix = sparse.vstack([self.matrix[keep], rows], format='csr')
+        self.job_ids = np.concatenate([self.job_ids[keep], ids])
+        if jobs:
+            self.watermark = max([job.updated_at for job in jobs] + ([self.watermark] if self.watermark else []))
+        self.removed.clear()
+
+    def refresh(self):
+        with self.lock:
+            if not self.built_at or time.monotonic() - self.built_at > FULL_REBUILD_SECONDS:
+                self.rebuild()
+            else:
+                self.update()
+
+    def discard(self, job_id):
+        """Drop a deleted job on the next refresh"""
+        self.removed.add(job_id)
+
+    def top_k(self, profiles, k, exclude=None):
+        """
+        Best `k` (job_id, score) pairs for each row of a profile matrix, best first.
+
+        `exclude` maps a row number to job ids that row must not be offered.
+        """
+        self.refresh()
+        with self.lock:
+            matrix, job_ids = self.matrix, self.job_ids
+        if not len(job_ids):
+            return [[] for _ in range(profiles.shape[0])]
+
+        # One (profiles x jobs) product scores every job for every profile
+        scores = (profiles @ matrix.T).toarray()
+        if exclude:
+            positions = {job_id: i for i, job_id in enumerate(job_ids.tolist())}
+            for row, ids in exclude.items():
+                columns = [positions[job_id] for job_id in ids if job_id in positions]
+                scores[row, columns] = 0.0
+
+        k = min(k, len(job_ids))
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        return [
+            [(int(job_ids[i]), round(float(score), 4)) for i, score in zip(row, row_scores) if score > 0]
+            for row, row_scores in zip(best, best_scores)
+        ]
+
+
+job_matrix = JobMatrix()
+
+# Stored list length; the dashboard shows fewer so closed or applied-to jobs can be skipped
+RECOMMENDATIONS_PER_SEEKER = 20
+
+
+def profile_signature(profile):
+    """Hash of the profile fields recommendations depend on"""
+    fields = (
+        profile.skills, profile.experience_level, profile.desired_job_types,
+        profile.desired_salary_min, profile.desired_salary_max,
+        profile.preferred_locations, profile.open_to_remote,
+    )
+    return hashlib.md5(repr(fields).encode()).hexdigest()
+
+
+def current_generation():
+    return SeekerRecommendations.objects.aggregate(latest=Max('generation'))['latest'] or 0
+
+
+def compute_recommendations(profiles, limit=RECOMMENDATIONS_PER_SEEKER):
+    """SeekerRecommendations (unsaved) for a batch of profiles, skipping jobs they already applied to"""
+    applied = {}
+    for profile_id, job_id in JobApplication.objects.filter(
+        applicant__in=[profile.pk for profile in profiles]
+    ).values_list('applicant_id', 'job_id'):
+        applied.setdefault(profile_id, set()).add(job_id)
+
+    exclude = {row: applied[profile.pk] for row, profile in enumerate(profiles) if profile.pk in applied}
+    ranked = job_matrix.top_k(profile_matrix(profiles), limit, exclude)
+    return [
+        SeekerRecommendations(
+            profile=profile,
+            job_ids=[job_id for job_id, _ in pairs],
+            scores=[score for _, score in pairs],
+            signature=profile_signature(profile),
+        )
+        for profile, pairs in zip(profiles, ranked)
+    ]
+
+
+def save_recommendations(rows, generation):
+    """Upsert computed lists in one statement"""
+    for row in rows:
+        row.generation = generation
+    SeekerRecommendations.objects.bulk_create(
+        rows, update_conflicts=True, unique_fields=['profile'],
+        update_fields=['job_ids', 'scores', 'signature', 'generation', 'updated_at']
+    )
+
+
+def refresh_profiles(profiles, generation=None):
+    """Recompute and store the lists of the given profiles"""
+    rows = compute_recommendations(list(profiles))
+    save_recommendations(rows, current_generation() if generation is None else generation)
+    return rows
+
+
+def push_job(job):
+    """
+    Offer a newly published job to existing lists without recomputing them.
+
+    Only seekers sharing a skill with the job are scored; the job replaces the
+    weakest entry of any list it beats.
+    """
+    from accounts.models import JobSeekerProfile
+
+    candidates = list(JobSeekerProfile.objects.filter(
+        profile_skills__skill__job_skills__job=job, recommendations__isnull=False
+    ).exclude(applications__job=job).distinct())
+    if not candidates:
+        return 0
+
+    job_row, _ = job_matrix.build_rows([job])
+    scores = (profile_matrix(candidates) @ job_row.T).toarray().ravel()
+    stored = SeekerRecommendations.objects.in_bulk([profile.pk for profile in candidates])
+
+    changed = []
+    for profile, score in zip(candidates, scores.tolist()):
+        row = stored.get(profile.pk)
+        score = round(score, 4)
+        if row is None or score <= 0:
+            continue
+        pairs = [(job_id, s) for job_id, s in zip(row.job_ids, row.scores) if job_id != job.pk]
+        if len(pairs) >= RECOMMENDATIONS_PER_SEEKER and score <= pairs[-1][1]:
+            continue
+        pairs.append((job.pk, score))
+        pairs.sort(key=lambda pair: -pair[1])
+        pairs = pairs[:RECOMMENDATIONS_PER_SEEKER]
+        row.job_ids = [job_id for job_id, _ in pairs]
+        row.scores = [s for _, s in pairs]
+        changed.append(row)
+
+    if changed:
+        SeekerRecommendations.objects.bulk_update(changed, ['job_ids', 'scores'])
+    return len(changed)
+
+
+def recommend_jobs(profile, limit=5):
+    """Top `limit` active jobs for a profile, read from its stored list (computed on first use)"""
+    row = SeekerRecommendations.objects.filter(profile=profile).first()
+    if row is None:
+        row = refresh_profiles([profile])[0]
+
+    scores = dict(zip(row.job_ids, row.scores))
+    jobs = Job.objects.filter(status='active').exclude(
+        applications__applicant=profile
+    ).select_related('company').in_bulk(row.job_ids)
+    recommended = []
+    for job_id in row.job_ids:
+        if job_id in jobs:
+            jobs[job_id].match_score = scores[job_id]
+            recommended.append(jobs[job_id])
+            if len(recommended) == limit:
+                break
+    return recommended
@@ -0,0 +1,117 @@
+# jobs/search.py - Ranked full-text search over jobs (SQLite FTS5)
+
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+
+# Columns: title, company, skills, location, description. Their BM25 weights
+# (10, 6, 4, 2, 1) are stored in the table's 'rank' config by migration
+# 0002_jobsearchindex; changing them takes a new migration that re-inserts it.
+FTS_TABLE = 'jobs_job_fts'
+
+INDEXED_JOB_FIELDS = {
+    'title', 'company', 'required_skills', 'preferred_skills', 'location', 'description',
+}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# Ordering of search results; ends in unique keys so it can drive keyset pagination
+RANKED_ORDERING = ('search_rank', '-created_at', '-id')
+
+
+def is_enabled():
+    """The FTS5 index only exists on SQLite"""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(text):
+    """Turn free user input into a safe FTS5 query of AND'ed prefix terms"""
+    tokens = TOKEN_RE.findall(text.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_jobs(queryset, text):
+    """Restrict a Job queryset to matches for `text`, best BM25 rank first"""
+    if not is_enabled():
+        return queryset.filter(
+            Q(title__icontains=text) |
+            Q(company__company_name__icontains=text) |
+            Q(location__icontains=text) |
+            Q(description__icontains=text)
+        ).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        ).order_by(*RANKED_ORDERING)
+
+    match = build_match_query(text)
+    if not match:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+
+    return queryset.filter(
+        search_index__document__match=match
+    ).annotate(
+        search_rank=F('search_index__rank')
+    ).order_by(*RANKED_ORDERING)
+
+
+def _job_row(job):
+    skills = ' '.join(filter(None, [job.required_skills, job.preferred_skills]))
+    return [job.pk, job.title, job.company.company_name, skills, job.location, job.description]
+
+
+def index_job(job):
+    """Insert or refresh a single job in the index"""
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, company, skills, location, description) '
+            'VALUES (%s, %s, %s, %s, %s, %s)',
+            _job_row(job)
+        )
+
+
+def remove_job(job_id):
+    """Drop a job from the index"""
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [job_id])
+
+
+def reindex_company(company):
+    """Refresh the company column for every job posted by `company`"""
+    if not is_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {FTS_TABLE} SET company = %s '
+            'WHERE rowid IN (SELECT id FROM jobs_job WHERE company_id = %s)',
+            [company.company_name, company.pk]
+        )
+
+
+def rebuild_index():
+    """Repopulate the whole index from the jobs table; returns the row count"""
+    from .models import Job
+
+    if not is_enabled():
+        return 0
+
+    count = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        jobs = Job.objects.select_related('company').only(
+            'title', 'company__company_name', 'required_skills',
+            'preferred_skills', 'location', 'description'
+        )
+        for job in jobs.iterator(chunk_size=500):
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, company, skills, location, description) '
+                'VALUES (%s, %s, %s, %s, %s, %s)',
+                _job_row(job)
+            )
+            count += 1
+        cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+    return count
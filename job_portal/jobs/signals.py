@@ -0,0 +1,248 @@
+# jobs/signals.py - Keep derived job data in sync with model changes
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from accounts.models import EmployerProfile, JobSeekerProfile
+from . import alerts, denormalized, matching, pagecache, recommendations, search, similarity, stats
+from .models import Job, JobApplication, JobCategory, Location, SavedJob, SeekerRecommendations, SiteCounter, sync_profile_skills
+
+User = get_user_model()
+
+@receiver(post_save, sender=Job)
+def index_job_on_save(sender, instance, update_fields=None, **kwargs):
+    """Refresh the full-text index unless only unindexed fields were saved"""
+    if update_fields and not search.INDEXED_JOB_FIELDS.intersection(update_fields):
+        return
+    search.index_job(instance)
+
+@receiver(post_delete, sender=Job)
+def unindex_job_on_delete(sender, instance, **kwargs):
+    """Remove deleted jobs from the full-text index"""
+    search.remove_job(instance.pk)
+
+@receiver(post_save, sender=EmployerProfile)
+def reindex_company_on_save(sender, instance, created, **kwargs):
+    """Company names are indexed on every job the employer posted"""
+    if not created and instance.get_loaded_value('company_name') != instance.company_name:
+        search.reindex_company(instance)
+
+@receiver(post_save, sender=Job)
+def refresh_location_counts_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Keep Location.active_jobs_count current when a job moves or changes status"""
+    if update_fields and not {'status', 'location', 'normalized_location'}.intersection(update_fields):
+        return
+    previous_location_id = instance.get_loaded_value('normalized_location_id')
+    previous_status = instance.get_loaded_value('status')
+    if (not created and previous_location_id == instance.normalized_location_id
+            and previous_status == instance.status):
+        return
+    Location.objects.refresh_active_counts({previous_location_id, instance.normalized_location_id})
+
+@receiver(post_delete, sender=Job)
+def refresh_location_counts_on_delete(sender, instance, **kwargs):
+    Location.objects.refresh_active_counts([instance.normalized_location_id])
+
+@receiver(post_save, sender=Job)
+def sync_job_skills_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Mirror the comma-separated skill fields into JobSkill rows"""
+    if update_fields and not {'required_skills', 'preferred_skills'}.intersection(update_fields):
+        return
+    if (not created
+            and instance.get_loaded_value('required_skills') == instance.required_skills
+            and instance.get_loaded_value('preferred_skills') == instance.preferred_skills):
+        return
+    instance.sync_skills()
+
+@receiver(post_save, sender=JobSeekerProfile)
+def sync_profile_skills_on_save(sender, instance, update_fields=None, **kwargs):
+    """Mirror JobSeekerProfile.skills into ProfileSkill rows"""
+    if update_fields and 'skills' not in update_fields:
+        return
+    sync_profile_skills(instance)
+
+@receiver(post_delete, sender=Job)
+def drop_job_from_recommendations(sender, instance, **kwargs):
+    """Saved jobs are picked up from updated_at; deletes leave no trace, so record them"""
+    recommendations.job_matrix.discard(instance.pk)
+
+@receiver(post_save, sender=Job)
+def push_published_job(sender, instance, created, update_fields=None, **kwargs):
+    """Offer newly published jobs to stored recommendation lists (runs after skill sync)"""
+    if instance.status != 'active':
+        return
+    if not created and instance.get_loaded_value('status') == 'active':
+        return
+    recommendations.push_job(instance)
+
+@receiver(post_save, sender=JobSeekerProfile)
+def refresh_recommendations_on_profile_save(sender, instance, created, **kwargs):
+    """Rebuild a stored list when the fields it was computed from change"""
+    if created:
+        return
+    stored = SeekerRecommendations.objects.filter(profile=instance).values_list('signature', flat=True).first()
+    if stored is not None and stored != recommendations.profile_signature(instance):
+        recommendations.refresh_profiles([instance])
+
+# Fields each side of an application's match score is computed from
+JOB_MATCH_FIELDS = ('required_skills', 'preferred_skills', 'experience_level', 'salary_min', 'salary_max')
+PROFILE_MATCH_FIELDS = ('skills', 'experience_level', 'desired_salary_min')
+
+@receiver(post_save, sender=Job)
+def clear_match_scores_on_job_save(sender, instance, created, **kwargs):
+    """Applicants are rescored on the next visit to the applications page"""
+    if created:
+        return
+    if any(instance.get_loaded_value(field) != getattr(instance, field) for field in JOB_MATCH_FIELDS):
+        matching.clear_job_scores(instance)
+
+@receiver(post_save, sender=JobSeekerProfile)
+def clear_match_scores_on_profile_save(sender, instance, created, **kwargs):
+    if created:
+        return
+    if any(instance.get_loaded_value(field) != getattr(instance, field) for field in PROFILE_MATCH_FIELDS):
+        matching.clear_profile_scores(instance)
+
+# Fields the similar-jobs index is built from
+SIMILARITY_FIELDS = (
+    'title', 'description', 'required_skills', 'preferred_skills',
+    'category_id', 'normalized_location_id', 'status',
+)
+
+@receiver(post_save, sender=Job)
+def update_similar_jobs_on_save(sender, instance, created, **kwargs):
+    """Queue the job's neighbour lists for recomputation outside the request"""
+    if not created and all(instance.get_loaded_value(field) == getattr(instance, field) for field in SIMILARITY_FIELDS):
+        return
+    similarity.queue_update(instance)
+
+@receiver(post_save, sender=Job)
+def queue_alerts_for_published_job(sender, instance, created, **kwargs):
+    """Match newly published jobs against saved searches"""
+    if instance.status != 'active':
+        return
+    if not created and instance.get_loaded_value('status') == 'active':
+        return
+    alerts.percolate(instance)
+
+@receiver(post_save, sender=JobApplication)
+def count_application(sender, instance, created, **kwargs):
+    if created:
+        stats.record(instance.job_id, applications=1)
+        denormalized.adjust({(Job, instance.job_id, 'applications_count'): 1})
+
+@receiver(post_delete, sender=JobApplication)
+def uncount_application(sender, instance, **kwargs):
+    denormalized.adjust({(Job, instance.job_id, 'applications_count'): -1})
+
+@receiver(post_save, sender=SavedJob)
+def count_save(sender, instance, created, **kwargs):
+    if created:
+        stats.record(instance.job_id, saves=1)
+        denormalized.adjust({(Job, instance.job_id, 'saves_count'): 1})
+
+@receiver(post_delete, sender=SavedJob)
+def uncount_save(sender, instance, **kwargs):
+    denormalized.adjust({(Job, instance.job_id, 'saves_count'): -1})
+
+def _active_job_deltas(status, category_id, company_id, sign):
+    """Counter changes for an active job entering (sign=1) or leaving (sign=-1) its category and company"""
+    if status != 'active':
+        return {}
+    deltas = {
+        SiteCounter.ACTIVE_JOBS: sign,
+        (EmployerProfile, company_id, 'active_jobs_count'): sign,
+    }
+    if category_id:
+        deltas[SiteCounter.category_key(category_id)] = sign
+        deltas[(JobCategory, category_id, 'active_jobs_count')] = sign
+    return deltas
+
+def _apply_active_job_deltas(deltas):
+    # String keys are SiteCounter rows, tuples are counter columns
+    SiteCounter.objects.apply({key: delta for key, delta in deltas.items() if isinstance(key, str)})
+    denormalized.adjust({key: delta for key, delta in deltas.items() if not isinstance(key, str)})
+
+@receiver(post_save, sender=Job)
+def count_active_job_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Move the job between the active-job counters of the site, its category and its company"""
+    if update_fields and not {'status', 'category', 'company'}.intersection(update_fields):
+        return
+    previous = {} if created else _active_job_deltas(
+        instance.get_loaded_value('status'), instance.get_loaded_value('category_id'),
+        instance.get_loaded_value('company_id'), -1
+    )
+    current = _active_job_deltas(instance.status, instance.category_id, instance.company_id, 1)
+    deltas = {key: previous.get(key, 0) + current.get(key, 0) for key in previous.keys() | current.keys()}
+    _apply_active_job_deltas(deltas)
+
+@receiver(post_delete, sender=Job)
+def count_active_job_on_delete(sender, instance, **kwargs):
+    _apply_active_job_deltas(_active_job_deltas(
+        instance.get_loaded_value('status'), instance.get_loaded_value('category_id'),
+        instance.get_loaded_value('company_id'), -1
+    ))
+
+@receiver(post_save, sender=EmployerProfile)
+def count_company_on_save(sender, instance, created, **kwargs):
+    if created:
+        SiteCounter.objects.apply({SiteCounter.COMPANIES: 1})
+
+@receiver(post_delete, sender=EmployerProfile)
+def count_company_on_delete(sender, instance, **kwargs):
+    SiteCounter.objects.apply({SiteCounter.COMPANIES: -1})
+
+@receiver(post_save, sender=User)
+def count_job_seeker_on_save(sender, instance, created, **kwargs):
+    if created and instance.user_type == 'job_seeker':
+        SiteCounter.objects.apply({SiteCounter.JOB_SEEKERS: 1})
+
+@receiver(post_delete, sender=User)
+def count_job_seeker_on_delete(sender, instance, **kwargs):
+    if instance.user_type == 'job_seeker':
+        SiteCounter.objects.apply({SiteCounter.JOB_SEEKERS: -1})
+
+def _shown_on_listings(job):
+    """Whether the job is active, or was when loaded"""
+    return job.status == 'active' or job.get_loaded_value('status') == 'active'
+
+@receiver(post_save, sender=Job)
+def expire_job_pages_on_save(sender, instance, update_fields=None, **kwargs):
+    """Drop cached anonymous pages that show the job (drafts and counter-only saves show nothing new)"""
+    if update_fields and set(update_fields) <= set(Job.COUNTER_FIELDS):
+        return
+    if _shown_on_listings(instance):
+        pagecache.invalidate(pagecache.LISTINGS, pagecache.job_tag(instance.pk))
+
+@receiver(post_delete, sender=Job)
+def expire_job_pages_on_delete(sender, instance, **kwargs):
+    if _shown_on_listings(instance):
+        pagecache.invalidate(pagecache.LISTINGS, pagecache.job_tag(instance.pk))
+
+# EmployerProfile fields shown on job listings, and also on job_detail pages
+LISTING_COMPANY_FIELDS = ('company_name', 'company_logo')
+DETAIL_COMPANY_FIELDS = LISTING_COMPANY_FIELDS + ('description', 'website')
+
+@receiver(post_save, sender=EmployerProfile)
+def expire_company_pages_on_save(sender, instance, created, **kwargs):
+    """Only edits to displayed fields expire pages; logins re-save the profile unchanged"""
+    if created:
+        return
+    changed = {
+        field for field in DETAIL_COMPANY_FIELDS
+        if instance.get_loaded_value(field) != getattr(instance, field)
+    }
+    if changed.intersection(LISTING_COMPANY_FIELDS):
+        pagecache.invalidate(pagecache.LISTINGS, pagecache.company_tag(instance.pk))
+    elif changed:
+        pagecache.invalidate(pagecache.company_tag(instance.pk))
+
+@receiver(post_delete, sender=EmployerProfile)
+def expire_company_pages_on_delete(sender, instance, **kwargs):
+    pagecache.invalidate(pagecache.LISTINGS, pagecache.company_tag(instance.pk))
+
+@receiver(post_save, sender=JobCategory)
+@receiver(post_delete, sender=JobCategory)
+def expire_category_pages(sender, instance, **kwargs):
+    pagecache.invalidate(pagecache.LISTINGS, pagecache.category_tag(instance.pk))
@@ -0,0 +1,215 @@
+# jobs/similarity.py - Precomputed "similar jobs" neighbour lists for job_detail
+
+import math
+import zlib
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from . import pagecache
+from .models import Job, JobNeighbour, JobNeighbourUpdate
+from .recommendations import JobMatrix, build_csr
+from .search import TOKEN_RE
+
+# Neighbours stored per job; job_detail shows the first few that are still active
+NEIGHBOURS_PER_JOB = 10
+
+# Job ids per query when reading the neighbour-list floors an update may beat
+CANDIDATE_BATCH_SIZE = 500
+
+# Text terms are hashed into TEXT_BUCKETS columns, followed by one column per
+# category and per location bucket
+TEXT_BUCKETS = 1 << 18
+CATEGORY_OFFSET = TEXT_BUCKETS
+CATEGORY_BUCKETS = 1 << 10
+LOCATION_OFFSET = CATEGORY_OFFSET + CATEGORY_BUCKETS
+LOCATION_BUCKETS = 1 << 14
+N_FEATURES = LOCATION_OFFSET + LOCATION_BUCKETS
+
+# Term frequency multiplier per field
+FIELD_WEIGHTS = (
+    ('title', 3.0),
+    ('required_skills', 2.0),
+    ('preferred_skills', 1.5),
+    ('description', 1.0),
+)
+
+# Score added to the text cosine when two jobs share a category / location
+CATEGORY_BONUS = 0.15
+LOCATION_BONUS = 0.10
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or our the to we will with you your'.split()
+)
+
+
+def _term_column(term):
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(term.encode()) % TEXT_BUCKETS
+
+
+def job_terms(job):
+    """Weighted term frequencies of a job's text fields, keyed by column"""
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS:
+        for token in TOKEN_RE.findall((getattr(job, field) or '').lower()):
+            if len(token) > 1 and token not in STOP_WORDS:
+                counts[_term_column(token)] += weight
+    return counts
+
+
+class SimilarityMatrix(JobMatrix):
+    """
+    TF-IDF rows for every active job, refreshed like JobMatrix.
+
+    Document frequencies are taken at each full rebuild; rows added
+    incrementally reuse them until the next one.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.matrix = sparse.csr_matrix((0, N_FEATURES), dtype=np.float32)
+        self.document_frequency = Counter()
+        self.documents = 0
+
+    def _fetch(self, queryset):
+        return list(queryset.only(
+            'title', 'description', 'required_skills', 'preferred_skills',
+            'category', 'normalized_location', 'status', 'updated_at'
+        ))
+
+    def rebuild(self):
+        jobs = self._fetch(Job.objects.filter(status='active'))
+        terms = [job_terms(job) for job in jobs]
+        self.document_frequency = Counter(column for counts in terms for column in counts)
+        self.documents = len(jobs)
+        super().rebuild()
+
+    def build_rows(self, jobs):
+        """CSR rows and id array for a list of jobs"""
+        rows = []
+        for job in jobs:
+            counts = job_terms(job)
+            weights = {
+                column: (1 + math.log(count)) * math.log((self.documents + 1) / (self.document_frequency[column] + 1)) + 1
+                for column, count in counts.items()
+            }
+            norm = math.sqrt(sum(value * value for value in weights.values())) or 1.0
+            entries = [(column, value / norm) for column, value in weights.items()]
+            if job.category_id:
+                entries.append((CATEGORY_OFFSET + job.category_id % CATEGORY_BUCKETS, math.sqrt(CATEGORY_BONUS)))
+            if job.normalized_location_id:
+                entries.append((LOCATION_OFFSET + job.normalized_location_id % LOCATION_BUCKETS, math.sqrt(LOCATION_BONUS)))
+            rows.append(entries)
+        return build_csr(rows, N_FEATURES), np.array([job.pk for job in jobs], dtype=np.int64)
+
+
+similarity_matrix = SimilarityMatrix()
+
+
+def _store(neighbours):
+    """Replace the neighbour rows of each job in `neighbours` ({job_id: [(id, score), ...]})"""
+    JobNeighbour.objects.filter(job__in=list(neighbours)).delete()
+    # The "similar jobs" on these jobs' pages change
+    pagecache.invalidate(*[pagecache.job_tag(job_id) for job_id in neighbours])
+    JobNeighbour.objects.bulk_create([
+        JobNeighbour(job_id=job_id, neighbour_id=neighbour_id, score=score)
+        for job_id, pairs in neighbours.items()
+        for neighbour_id, score in pairs
+    ])
+
+
+def rebuild_neighbours(chunk_size=500):
+    """Recompute every active job's neighbour list; returns the number of jobs"""
+    started = timezone.now()
+    similarity_matrix.refresh()
+    with similarity_matrix.lock:
+        matrix, job_ids = similarity_matrix.matrix, similarity_matrix.job_ids
+
+    JobNeighbour.objects.exclude(job__status='active').delete()
+    for start in range(0, len(job_ids), chunk_size):
+        ids = job_ids[start:start + chunk_size].tolist()
+        ranked = similarity_matrix.top_k(
+            matrix[start:start + chunk_size], NEIGHBOURS_PER_JOB,
+            exclude={row: {job_id} for row, job_id in enumerate(ids)}
+        )
+        _store(dict(zip(ids, ranked)))
+    # Updates queued before the rebuild read the jobs are covered by it
+    JobNeighbourUpdate.objects.filter(queued_at__lt=started).delete()
+    return len(job_ids)
+
+
+def update_job_neighbours(job):
+    """
+    Incremental update after a job is saved.
+
+    Recomputes the job's own list and offers it to every list it now beats.
+    Inactive jobs just lose their list; readers skip inactive neighbours.
+    """
+    if job.status != 'active':
+        JobNeighbour.objects.filter(job=job).delete()
+        return
+
+    similarity_matrix.refresh()
+    row, _ = similarity_matrix.build_rows([job])
+    ranked = similarity_matrix.top_k(row, len(similarity_matrix.job_ids), exclude={0: {job.pk}})[0]
+    scores = dict(ranked)
+
+    # Only lists that are short, that this job beats, or that already mention it change;
+    # floors are read just for the jobs it scored against, through the (job, score) index
+    changed = {job.pk: ranked[:NEIGHBOURS_PER_JOB]}
+    scored = list(scores)
+    candidates = []
+    for start in range(0, len(scored), CANDIDATE_BATCH_SIZE):
+        floors = JobNeighbour.objects.filter(job__in=scored[start:start + CANDIDATE_BATCH_SIZE]).values('job').annotate(
+            floor=Min('score'), size=Count('id')
+        ).order_by()
+        candidates.extend(
+            entry['job'] for entry in floors
+            if entry['size'] < NEIGHBOURS_PER_JOB or scores[entry['job']] > entry['floor']
+        )
+    lists = {}
+    for job_id, neighbour_id, score in JobNeighbour.objects.filter(
+        Q(job__in=candidates) | Q(neighbour=job)
+    ).exclude(job=job).values_list('job_id', 'neighbour_id', 'score'):
+        lists.setdefault(job_id, []).append((neighbour_id, score))
+
+    for other_id, pairs in lists.items():
+        pairs = [(neighbour_id, s) for neighbour_id, s in pairs if neighbour_id != job.pk]
+        if other_id in scores:
+            pairs.append((job.pk, scores[other_id]))
+        pairs.sort(key=lambda pair: -pair[1])
+        changed[other_id] = pairs[:NEIGHBOURS_PER_JOB]
+    _store(changed)
+
+
+def queue_update(job):
+    """Mark a saved job's neighbour lists for the next build_similar_jobs --pending run"""
+    JobNeighbourUpdate.objects.update_or_create(job=job)
+
+
+def process_pending(limit=None):
+    """
+    Run update_job_neighbours for queued jobs, oldest first; returns jobs processed.
+
+    Entries are removed only if they weren't queued again meanwhile, so a job
+    saved during its update is picked up by the next run.
+    """
+    queued = JobNeighbourUpdate.objects.select_related('job').order_by('queued_at')
+    processed = 0
+    for entry in queued[:limit] if limit else queued:
+        update_job_neighbours(entry.job)
+        JobNeighbourUpdate.objects.filter(pk=entry.pk, queued_at=entry.queued_at).delete()
+        processed += 1
+    return processed
+
+
+def similar_jobs(job, limit=3):
+    """Active neighbours of a job, best first, with the company joined (one query)"""
+    return Job.objects.filter(
+        neighbour_of__job=job, status='active'
+    ).select_related('company').order_by('-neighbour_of__score')[:limit]
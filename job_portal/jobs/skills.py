@@ -0,0 +1,51 @@
+# jobs/skills.py - Helpers for parsing and normalizing skill names
+
+from functools import lru_cache
+
+# Common shorthand -> canonical skill name
+DEFAULT_SKILL_ALIASES = {
+    'js': 'JavaScript',
+    'javascript': 'JavaScript',
+    'ecmascript': 'JavaScript',
+    'ts': 'TypeScript',
+    'py': 'Python',
+    'python3': 'Python',
+    'postgres': 'PostgreSQL',
+    'postgresql': 'PostgreSQL',
+    'psql': 'PostgreSQL',
+    'mysql': 'MySQL',
+    'mongo': 'MongoDB',
+    'reactjs': 'React',
+    'react.js': 'React',
+    'node': 'Node.js',
+    'nodejs': 'Node.js',
+    'vuejs': 'Vue.js',
+    'vue': 'Vue.js',
+    'golang': 'Go',
+    'k8s': 'Kubernetes',
+    'ml': 'Machine Learning',
+    'ai': 'Artificial Intelligence',
+    'gcp': 'Google Cloud',
+    'amazon web services': 'AWS',
+    'css3': 'CSS',
+    'html5': 'HTML',
+}
+
+
+def normalize_skill_key(name):
+    """Case-fold and collapse whitespace, keeping symbols that matter (C++, C#, .NET)"""
+    return ' '.join((name or '').lower().split())
+
+
+@lru_cache(maxsize=4096)
+def split_skills(text):
+    """Parse a comma-separated skill string into unique, stripped names (cached per string)"""
+    seen = set()
+    skills = []
+    for part in (text or '').split(','):
+        name = ' '.join(part.split())
+        key = normalize_skill_key(name)
+        if key and key not in seen:
+            seen.add(key)
+            skills.append(name)
+    return tuple(skills)
@@ -0,0 +1,131 @@
+# jobs/stats.py - Incremental upserts into the JobDailyStats rollup, and time-series reads
+
+import hashlib
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .hll import HyperLogLog
+from .models import JobDailyStats, JobViewerSketch
+
+STAT_FIELDS = ('views', 'unique_viewers', 'saves', 'applications')
+
+
+def viewer_key(request):
+    """Stable id for whoever made a request: the user, else a hash of address and agent"""
+    if request.user.is_authenticated:
+        return f'u{request.user.pk}'
+    raw = f"{request.META.get('REMOTE_ADDR', '')}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return 'a' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def record_many(increments):
+    """
+    Add counts to many (job_id, date) rows: {(job_id, date): {'views': 3, ...}}.
+
+    Missing rows are inserted first; each group of rows sharing a date and the
+    same increments is then bumped with one atomic F() UPDATE.
+    """
+    if not increments:
+        return
+    groups = {}
+    for (job_id, day), counts in increments.items():
+        counts = tuple(sorted((field, n) for field, n in counts.items() if n))
+        if counts:
+            groups.setdefault((day, counts), []).append(job_id)
+
+    with transaction.atomic():
+        JobDailyStats.objects.bulk_create(
+            [JobDailyStats(job_id=job_id, date=day) for job_id, day in increments],
+            ignore_conflicts=True
+        )
+        for (day, counts), job_ids in groups.items():
+            JobDailyStats.objects.filter(job_id__in=job_ids, date=day).update(
+                **{field: F(field) + n for field, n in counts}
+            )
+
+
+def record(job_id, day=None, **counts):
+    """Add counts to one job's row for `day` (today by default), e.g. record(job.pk, saves=1)"""
+    record_many({(job_id, day or timezone.localdate()): counts})
+
+
+def merge_viewer_sketches(sketches):
+    """
+    Fold buffered sketches {(job_id, date): HyperLogLog} into the stored daily
+    and all-time sketches, refreshing their unique_viewers estimates.
+    """
+    if not sketches:
+        return
+    lifetime = {}
+    by_day = {}
+    for (job_id, day), sketch in sketches.items():
+        lifetime.setdefault(job_id, HyperLogLog()).merge(sketch)
+        by_day.setdefault(day, []).append(job_id)
+
+    with transaction.atomic():
+        JobDailyStats.objects.bulk_create(
+            [JobDailyStats(job_id=job_id, date=day) for job_id, day in sketches], ignore_conflicts=True
+        )
+        JobViewerSketch.objects.bulk_create(
+            [JobViewerSketch(job_id=job_id) for job_id in lifetime], ignore_conflicts=True
+        )
+
+        daily_rows = []
+        for day, job_ids in by_day.items():
+            for row in JobDailyStats.objects.select_for_update().filter(date=day, job_id__in=job_ids):
+                sketch = HyperLogLog.from_bytes(row.viewer_sketch).merge(sketches[(row.job_id, day)])
+                row.viewer_sketch = sketch.to_bytes()
+                row.unique_viewers = sketch.count()
+                daily_rows.append(row)
+        JobDailyStats.objects.bulk_update(daily_rows, ['viewer_sketch', 'unique_viewers'])
+
+        lifetime_rows = list(JobViewerSketch.objects.select_for_update().filter(job_id__in=list(lifetime)))
+        for row in lifetime_rows:
+            sketch = HyperLogLog.from_bytes(row.sketch).merge(lifetime[row.job_id])
+            row.sketch = sketch.to_bytes()
+            row.unique_viewers = sketch.count()
+        JobViewerSketch.objects.bulk_update(lifetime_rows, ['sketch', 'unique_viewers'])
+
+
+def unique_viewers(job_ids, start=None, end=None):
+    """
+    Approximate distinct viewers per job over a date range (merging daily sketches),
+    or all-time when no range is given: {job_id: estimate}.
+    """
+    if start is None and end is None:
+        return dict(JobViewerSketch.objects.filter(job_id__in=job_ids).values_list('job_id', 'unique_viewers'))
+    merged = {}
+    rows = JobDailyStats.objects.filter(job_id__in=job_ids, date__range=(start, end or timezone.localdate()))
+    for job_id, data in rows.values_list('job_id', 'viewer_sketch'):
+        merged.setdefault(job_id, HyperLogLog()).merge(HyperLogLog.from_bytes(data))
+    return {job_id: sketch.count() for job_id, sketch in merged.items()}
+
+
+def daily_series(queryset=None, days=30, end=None):
+    """
+    Totals per day for the last `days` days, oldest first, zero-filled.
+
+    `queryset` narrows the rows (e.g. to one employer's jobs) and is summed in
+    one GROUP BY query.
+    """
+    end = end or timezone.localdate()
+    start = end - timedelta(days=days - 1)
+    queryset = JobDailyStats.objects.all() if queryset is None else queryset
+    rows = {
+        row['date']: row
+        for row in queryset.filter(date__range=(start, end)).values('date').annotate(
+            **{field: Sum(field) for field in STAT_FIELDS}
+        ).order_by()
+    }
+    series = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = rows.get(day, {})
+        point = {'date': day.strftime('%Y-%m-%d')}
+        point.update({field: row.get(field) or 0 for field in STAT_FIELDS})
+        point['conversion'] = round(point['applications'] / point['views'] * 100, 1) if point['views'] else 0
+        series.append(point)
+    return series
@@ -1,3 +1,279 @@
-from django.test import TestCase
+import base64
+import json
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.urls import include, path, reverse
+
+from accounts.models import User
+from . import alerts, pagecache, similarity
+from .counters import ViewCounter
+from .gazetteer import grid_cell
+from .models import Job, JobNeighbour, JobNeighbourUpdate, JobSearchIndex, Location
+from .pagination import CursorPaginator, encode_cursor
+
+# The templates link across apps, which the deployed root URLconf doesn't mount
+urlpatterns = [
+    path('accounts/', include('accounts.urls')),
+    path('admin-panel/', include('admin_panel.urls')),
+    path('', include('jobs.urls')),
+]
+
+
+def raw_cursor(payload):
+    """A hand-made cursor token, as a visitor could edit one"""
+    data = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+@override_settings(ROOT_URLCONF='jobs.tests')
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='x', user_type='employer'
+        )
+        cls.jobs = [
+            Job.objects.create(
+                company=employer.employer_profile, title=f'Job {i}', description='d',
+                requirements='r', responsibilities='r', location='Remote', status='active',
+                # Every third job has no deadline
+                deadline=None if i % 3 == 0 else date(2030, 1, 1) + timedelta(days=i % 4),
+            )
+            for i in range(7)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def walk(self, paginator):
+        """Ids of every page, following next cursors from the first page"""
+        pages, page = [], paginator.get_page()
+        pages.append([job.pk for job in page])
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+            pages.append([job.pk for job in page])
+        return pages
+
+    def test_next_and_previous_pages(self):
+        paginator = CursorPaginator(Job.objects.all(), 3, ordering=('-created_at', '-id'))
+        pages = self.walk(paginator)
+        expected = sorted((job.pk for job in self.jobs), reverse=True)
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        last = paginator.get_page(paginator.get_page(paginator.get_page().next_cursor).next_cursor)
+        previous = paginator.get_page(last.previous_cursor)
+        self.assertEqual([job.pk for job in previous], pages[1])
+        self.assertTrue(previous.has_previous())
+
+    def test_nullable_key_sorts_nulls_last(self):
+        queryset = Job.objects.all()
+        paginator = CursorPaginator(queryset, 2, ordering=('deadline', '-id'))
+        pages = self.walk(paginator)
+        ordered = sum(pages, [])
+        self.assertEqual(ordered, [job.pk for job in sorted(
+            self.jobs, key=lambda job: (job.deadline is None, job.deadline or date.min, -job.pk)
+        )])
+
+        # Walking back from the last page returns the same pages
+        page = paginator.get_page()
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+        backwards = [[job.pk for job in page]]
+        while page.has_previous():
+            page = paginator.get_page(page.previous_cursor)
+            backwards.insert(0, [job.pk for job in page])
+        self.assertEqual(backwards, pages)
+
+    def test_invalid_cursor_is_first_page(self):
+        paginator = CursorPaginator(Job.objects.all(), 3, ordering=('-created_at', '-id'))
+        first = [job.pk for job in paginator.get_page()]
+        for cursor in [
+            'not base64 !',
+            raw_cursor(['sideways', {'dt': '2030-01-01T00:00:00'}, 1]),
+            raw_cursor(['next', 'abc', 5]),
+            raw_cursor(['next', None, None]),
+            raw_cursor(['next', {'dt': 'garbage'}, 1]),
+            raw_cursor(['next', {'dt': '2030-01-01T00:00:00'}, 'abc']),
+            raw_cursor(['next', {'dt': '2030-01-01T00:00:00'}, [1]]),
+            raw_cursor(['next', 1]),
+        ]:
+            with self.subTest(cursor=cursor):
+                page = paginator.get_page(cursor)
+                self.assertEqual([job.pk for job in page], first)
+                self.assertFalse(page.has_previous())
+
+    def test_null_rejected_for_non_nullable_key(self):
+        paginator = CursorPaginator(Job.objects.all(), 3, ordering=('deadline', '-id'))
+        self.assertIsNone(paginator.clean_values([None, None]))
+        self.assertEqual(paginator.clean_values([None, '4']), [None, 4])
+
+    def test_job_list_ignores_tampered_cursor(self):
+        for payload in (['next', 'abc', 5], ['next', None, None], ['prev', 1, 2, 3]):
+            with self.subTest(payload=payload):
+                response = self.client.get(reverse('jobs:job_list'), {'cursor': raw_cursor(payload)})
+                self.assertEqual(response.status_code, 200)
+
+    def test_encoded_cursor_round_trip(self):
+        job = self.jobs[3]
+        paginator = CursorPaginator(Job.objects.all(), 3, ordering=('-created_at', '-id'))
+        page = paginator.get_page(encode_cursor([job.created_at, job.pk], 'next'))
+        self.assertTrue(all(other.pk < job.pk for other in page))
+
+
+class LocationMatchTests(TestCase):
+    def test_match_ids_keeps_partial_matches_with_exact_hit(self):
+        dhaka = Location.objects.resolve('Dhaka')
+        banani = Location.objects.resolve('Banani, Dhaka')
+        Location.objects.resolve('Chittagong')
+        self.assertCountEqual(Location.objects.match_ids('dhaka'), [dhaka.pk, banani.pk])
+        self.assertEqual(Location.objects.match_ids('banani'), [banani.pk])
+        self.assertEqual(Location.objects.match_ids('  '), [])
+
+    def test_editing_a_location_moves_its_coordinates(self):
+        location = Location.objects.resolve('Dhaka')
+        self.assertIsNotNone(location.latitude)
+        location = Location.objects.get(pk=location.pk)
+        location.name = location.city = 'Chittagong'
+        location.save()
+        chittagong = Location.objects.resolve('Chittagong')
+        location.refresh_from_db()
+        self.assertEqual((location.latitude, location.grid_cell), (chittagong.latitude, chittagong.grid_cell))
+
+        # Coordinates set by hand alongside an edit are kept
+        location.name = 'Chattogram'
+        location.latitude, location.longitude = 1.0, 2.0
+        location.save()
+        location.refresh_from_db()
+        self.assertEqual((location.latitude, location.longitude), (1.0, 2.0))
+        self.assertEqual(location.grid_cell, grid_cell(1.0, 2.0))
+
+
+class SearchIndexTests(TestCase):
+    def test_company_rename_reindexes_but_login_does_not(self):
+        employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='x', user_type='employer'
+        )
+        profile = employer.employer_profile
+        profile.company_name = 'Acme'
+        profile.save()
+        job = Job.objects.create(
+            company=profile, title='Clerk', description='d', requirements='r',
+            responsibilities='r', location='Remote', status='active',
+        )
+        self.assertEqual(JobSearchIndex.objects.get(job=job).company, 'Acme')
+
+        # Logins save the profile without changing it: the index is left alone
+        JobSearchIndex.objects.filter(job=job).update(company='stale')
+        employer.save(update_fields=['last_login'])
+        self.assertEqual(JobSearchIndex.objects.get(job=job).company, 'stale')
+
+        profile = type(profile).objects.get(pk=profile.pk)
+        profile.company_name = 'Acme Corp'
+        profile.save()
+        self.assertEqual(JobSearchIndex.objects.get(job=job).company, 'Acme Corp')
+
+
+class PageCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='x', user_type='employer'
+        )
+        self.profile = self.employer.employer_profile
+
+    def versions(self):
+        return {
+            tag: cache.get(pagecache._tag_key(tag))
+            for tag in (pagecache.LISTINGS, pagecache.company_tag(self.profile.pk))
+        }
+
+    def assertExpires(self, tags, action):
+        before = self.versions()
+        action()
+        after = self.versions()
+        self.assertEqual({tag for tag in after if after[tag] != before[tag]}, set(tags))
+
+    def test_only_displayed_changes_expire_pages(self):
+        listings, company = pagecache.LISTINGS, pagecache.company_tag(self.profile.pk)
+        job = Job.objects.create(
+            company=self.profile, title='Clerk', description='d', requirements='r',
+            responsibilities='r', location='Remote', status='draft',
+        )
+        self.assertExpires([], lambda: self.employer.save(update_fields=['last_login']))
+
+        job = Job.objects.get(pk=job.pk)
+        job.title = 'Senior clerk'
+        self.assertExpires([], job.save)
+        job.status = 'active'
+        self.assertExpires([listings], job.save)
+        self.assertExpires([], lambda: job.save(update_fields=['views_count']))
+
+        profile = type(self.profile).objects.get(pk=self.profile.pk)
+        profile.description = 'We make things'
+        self.assertExpires([company], profile.save)
+        profile.company_name = 'Acme'
+        self.assertExpires([listings, company], profile.save)
+
+
+class SimilarJobsTests(TestCase):
+    def test_saved_jobs_are_queued_and_processed_outside_the_request(self):
+        employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='x', user_type='employer'
+        )
+        jobs = [
+            Job.objects.create(
+                company=employer.employer_profile, title=f'Python developer {i}', description='django python',
+                requirements='r', responsibilities='r', location='Remote', status='active',
+            )
+            for i in range(3)
+        ]
+        self.assertEqual(JobNeighbour.objects.count(), 0)
+        self.assertEqual(JobNeighbourUpdate.objects.count(), 3)
+
+        self.assertEqual(similarity.process_pending(), 3)
+        self.assertEqual(JobNeighbourUpdate.objects.count(), 0)
+        self.assertCountEqual(
+            [job.pk for job in similarity.similar_jobs(jobs[0])], [jobs[1].pk, jobs[2].pk]
+        )
+
+
+@override_settings(SITE_URL='https://jobs.example.com/')
+class SavedSearchAlertTests(TestCase):
+    def test_salary_max_is_saved_and_matched(self):
+        seeker = User.objects.create_user(
+            username='seeker', email='seeker@example.com', password='x', user_type='job_seeker'
+        )
+        employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='x', user_type='employer'
+        )
+        saved = alerts.create_saved_search(seeker.job_seeker_profile, QueryDict('salary_max=5000'))
+        self.assertEqual((saved.salary_max, saved.query), (5000, {'salary_max': '5000'}))
+
+        def job(salary_max):
+            return Job(
+                company=employer.employer_profile, title='Clerk', description='d', requirements='r',
+                responsibilities='r', location='Remote', salary_max=salary_max,
+            )
+        self.assertTrue(alerts.matches(saved, job(4000), set(), set()))
+        self.assertFalse(alerts.matches(saved, job(6000), set(), set()))
+        self.assertFalse(alerts.matches(saved, job(None), set(), set()))
+
+    def test_digest_links_are_absolute(self):
+        url = alerts.job_url(Job(pk=7))
+        self.assertEqual(url, 'https://jobs.example.com' + reverse('jobs:job_detail', kwargs={'pk': 7}))
+
+
+class ViewCounterTests(TestCase):
+    def test_full_buffer_wakes_the_flush_thread_instead_of_writing(self):
+        counter = ViewCounter(interval=3600, max_pending=2)
+        counter._ensure_thread = lambda: None
+        with self.assertNumQueries(0):
+            counter.add(1)
+            self.assertFalse(counter.wakeup.is_set())
+            counter.add(1)
+        self.assertTrue(counter.wakeup.is_set())
+        self.assertEqual(counter.pending_for(1), 2)
@@ -21,6 +21,8 @@ urlpatterns = [
     path('application/<int:pk>/', views.application_detail, name='application_detail'),
     path('application/<int:pk>/withdraw/', views.withdraw_application, name='withdraw_application'),
     path('saved-jobs/', views.saved_jobs, name='saved_jobs'),
+    path('saved-searches/save/', views.save_search, name='save_search'),
+    path('saved-searches/<int:pk>/delete/', views.delete_saved_search, name='delete_saved_search'),
     
     # Employer job management views
     path('employer/dashboard/', views.employer_dashboard, name='employer_dashboard'),
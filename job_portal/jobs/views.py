@@ -1,19 +1,35 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q, Count
+from django.db.models import Q, Count, F
 from django.http import JsonResponse, HttpResponseRedirect
 from django.views.decorators.http import require_POST
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from urllib.parse import urlencode
 
-from .models import Job, JobCategory, JobApplication, SavedJob
+from .models import Job, JobCategory, JobApplication, JobDailyStats, SavedJob, SavedSearch, SiteCounter, Location, Skill
 from .forms import JobForm, JobSearchForm, JobApplicationForm, ApplicationStatusForm
+from .alerts import create_saved_search
+from .facets import job_facets
+from .gazetteer import geocode
+from .matching import score_applications
+from .counters import view_counter
+from .pagecache import add_tags, cache_anonymous_page, category_tag, company_tag, job_tag
+from .pagination import CursorPaginator
+from .search import search_jobs, RANKED_ORDERING
+from .similarity import similar_jobs
+from . import stats
+from .stats import daily_series, viewer_key
 from accounts.models import EmployerProfile, JobSeekerProfile
 
+# "Within N km" options offered by job_list, and the largest radius accepted
+RADIUS_CHOICES_KM = ['10', '25', '50', '100', '250']
+MAX_SEARCH_RADIUS_KM = 500
+
 # ADD THIS NEW VIEW AT THE BEGINNING (before your existing views)
+@cache_anonymous_page()
 def home(request):
     """Homepage with job search, featured jobs, and statistics"""
     
@@ -22,24 +38,16 @@ def home(request):
         'company', 'category'
     ).order_by('-created_at')[:6]
     
-    # Get job statistics
-    total_jobs = Job.objects.filter(status='active').count()
-    total_companies = EmployerProfile.objects.count()
-    
-    # Count job seekers (users with job_seeker user_type)
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-    total_job_seekers = User.objects.filter(user_type='job_seeker').count()
+    # Headline numbers and popular categories from the counter table (one query)
+    totals, popular_categories = SiteCounter.objects.snapshot()
+    total_jobs = totals.get(SiteCounter.ACTIVE_JOBS, 0)
+    total_companies = totals.get(SiteCounter.COMPANIES, 0)
+    total_job_seekers = totals.get(SiteCounter.JOB_SEEKERS, 0)
     
-    # Get popular job categories with job counts
-    popular_categories = JobCategory.objects.annotate(
-        job_count=Count('job', filter=Q(job__status='active'))
-    ).filter(job_count__gt=0).order_by('-job_count')[:8]
-    
-    # Get recent job locations
-    recent_locations = Job.objects.filter(
-        status='active'
-    ).values_list('location', flat=True).distinct()[:10]
+    # Get top job locations (precomputed active-job counts)
+    recent_locations = Location.objects.filter(
+        active_jobs_count__gt=0
+    ).order_by('-active_jobs_count')[:10]
     
     # Process search if coming from homepage search
     if request.GET.get('q') or request.GET.get('location'):
@@ -72,6 +80,7 @@ def home(request):
     return render(request, 'jobs/home.html', context)
 
 # Public Views
+@cache_anonymous_page()
 def job_list(request):
     """Display list of all active jobs with search and filtering"""
     jobs = Job.objects.filter(status='active').select_related('company', 'category').order_by('-created_at')
@@ -79,28 +88,61 @@ def job_list(request):
     # Search functionality
     search_query = request.GET.get('search', '')
     if search_query:
-        jobs = jobs.filter(
-            Q(title__icontains=search_query) |
-            Q(company__company_name__icontains=search_query) |
-            Q(location__icontains=search_query) |
-            Q(description__icontains=search_query)
-        )
+        jobs = search_jobs(jobs, search_query)
     
     # Category filter
     category_id = request.GET.get('category', '')
     if category_id:
         jobs = jobs.filter(category_id=category_id)
     
-    # Location filter
+    # Location filter (location id from the dropdown, or free text resolved via aliases)
     location = request.GET.get('location', '')
     if location:
-        jobs = jobs.filter(location__icontains=location)
+        if location.isdigit():
+            jobs = jobs.filter(normalized_location_id=location)
+        else:
+            jobs = jobs.filter(normalized_location_id__in=Location.objects.match_ids(location))
+    
+    # Radius filter ("within N km of <place>", defaults to the seeker's own city)
+    near = request.GET.get('near', '')
+    radius = request.GET.get('radius', '')
+    if radius:
+        origin = geocode(near) if near else None
+        if not near and request.user.is_authenticated and request.user.user_type == 'job_seeker':
+            profile = getattr(request.user, 'job_seeker_profile', None)
+            if profile and profile.latitude is not None:
+                origin = (profile.latitude, profile.longitude)
+        try:
+            radius_km = min(float(radius), MAX_SEARCH_RADIUS_KM)
+        except ValueError:
+            radius_km = None
+        if origin and radius_km and radius_km > 0:
+            jobs = jobs.filter(
+                normalized_location_id__in=Location.objects.within_radius(*origin, radius_km)
+            )
+        elif near:
+            messages.warning(request, f'Could not find a location named "{near}".')
+    
+    # Skill filter (canonical skill name or alias, joined through JobSkill)
+    skill = request.GET.get('skill', '')
+    if skill:
+        jobs = jobs.filter(job_skills__skill__in=Skill.objects.resolve_many([skill], create=False))
     
     # Job type filter
     job_type = request.GET.get('job_type', '')
     if job_type:
         jobs = jobs.filter(job_type=job_type)
     
+    # Experience level filter
+    experience_level = request.GET.get('experience_level', '')
+    if experience_level:
+        jobs = jobs.filter(experience_level=experience_level)
+    
+    # Remote filter (checkbox sends "on")
+    is_remote = request.GET.get('is_remote', '')
+    if is_remote:
+        jobs = jobs.filter(is_remote=True)
+    
     # Salary range filter
     salary_min = request.GET.get('salary_min', '')
     salary_max = request.GET.get('salary_max', '')
@@ -109,38 +151,55 @@ def job_list(request):
     if salary_max:
         jobs = jobs.filter(salary_max__lte=salary_max)
     
-    # Pagination
-    paginator = Paginator(jobs, 12)  # Show 12 jobs per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Pagination (keyset on the listing order, no OFFSET scans)
+    ordering = RANKED_ORDERING if search_query else ('-created_at', '-id')
+    paginator = CursorPaginator(jobs, 12, ordering=ordering)  # Show 12 jobs per page
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     # Get categories for filter dropdown
     categories = JobCategory.objects.all()
     
-    # Get unique locations for filter
-    locations = Job.objects.filter(status='active').values_list('location', flat=True).distinct()
+    # Facet counts for the current filter set (one aggregation query)
+    facet_counts = job_facets(jobs, categories)
+    
+    # Get locations with active jobs for filter
+    locations = Location.objects.filter(active_jobs_count__gt=0).order_by('-active_jobs_count')
     
     context = {
+        'form': JobSearchForm(request.GET),
         'page_obj': page_obj,
         'search_query': search_query,
         'categories': categories,
+        'facet_counts': facet_counts,
         'locations': locations,
         'selected_category': category_id,
         'selected_location': location,
         'selected_job_type': job_type,
+        'selected_experience_level': experience_level,
+        'selected_skill': skill,
+        'near': near,
+        'radius': radius,
+        'radius_choices': RADIUS_CHOICES_KM,
+        'is_remote': bool(is_remote),
         'salary_min': salary_min,
         'salary_max': salary_max,
-        'total_jobs': jobs.count(),
+        'total_jobs': paginator.count,
     }
     
     return render(request, 'jobs/job_list.html', context)
 
+def count_cached_job_view(request, pk):
+    """job_detail's view counting, for pages served from the anonymous cache"""
+    view_counter.add(pk, viewer=viewer_key(request))
+
+@cache_anonymous_page(tags=(), on_hit=count_cached_job_view)
 def job_detail(request, pk):
     """Display detailed view of a job"""
     job = get_object_or_404(Job, pk=pk, status='active')
     
-    # Increment view count
-    job.increment_views()
+    # Increment view count and add the viewer to the unique-viewer sketch
+    job.increment_views(viewer=viewer_key(request))
+    unique_viewers = stats.unique_viewers([job.pk]).get(job.pk, 0)
     
     # Check if user has applied (for job seekers)
     has_applied = False
@@ -156,16 +215,24 @@ def job_detail(request, pk):
                 job=job, user=job_seeker_profile
             ).exists()
     
-    # Get related jobs (same category)
-    related_jobs = Job.objects.filter(
-        category=job.category, status='active'
-    ).exclude(pk=job.pk)[:3]
+    # Get related jobs (precomputed neighbours, else same category)
+    related_jobs = list(similar_jobs(job))
+    if not related_jobs:
+        related_jobs = Job.objects.filter(
+            category=job.category, status='active'
+        ).exclude(pk=job.pk).select_related('company')[:3]
+    
+    add_tags(
+        request, job_tag(job.pk), company_tag(job.company_id), category_tag(job.category_id),
+        *[job_tag(related.pk) for related in related_jobs]
+    )
     
     context = {
         'job': job,
         'has_applied': has_applied,
         'is_saved': is_saved,
         'related_jobs': related_jobs,
+        'unique_viewers': unique_viewers,
     }
     
     return render(request, 'jobs/job_detail.html', context)
@@ -184,7 +251,7 @@ def employer_dashboard(request):
     jobs = Job.objects.filter(company=employer_profile)
     job_stats = {
         'total_jobs': jobs.count(),
-        'active_jobs': jobs.filter(status='active').count(),
+        'active_jobs': employer_profile.active_jobs_count,
         'draft_jobs': jobs.filter(status='draft').count(),
         'closed_jobs': jobs.filter(status='closed').count(),
     }
@@ -202,10 +269,15 @@ def employer_dashboard(request):
         shortlisted=Count('id', filter=Q(status='shortlisted'))
     )
     
+    # Daily views / applications for the last 30 days (from the JobDailyStats rollup)
+    daily_stats = daily_series(JobDailyStats.objects.filter(job__company=employer_profile), days=30)
+    
     context = {
         'job_stats': job_stats,
         'recent_applications': recent_applications,
         'app_stats': app_stats,
+        'daily_stats': daily_stats,
+        'views_last_30_days': sum(day['views'] for day in daily_stats),
     }
     
     return render(request, 'jobs/employer_dashboard.html', context)
@@ -218,13 +290,12 @@ def employer_jobs(request):
         return redirect('jobs:job_list')
     
     employer_profile = get_object_or_404(EmployerProfile, user=request.user)
-    jobs = Job.objects.filter(company=employer_profile).order_by('-created_at')
+    jobs = Job.objects.filter(company=employer_profile)
     
-    paginator = Paginator(jobs, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = CursorPaginator(jobs, 10, ordering=('-created_at', '-id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
-    context = {'page_obj': page_obj}
+    context = {'page_obj': page_obj, 'jobs': page_obj}
     return render(request, 'jobs/employer_jobs.html', context)
 
 @login_required
@@ -377,11 +448,10 @@ def my_applications(request):
     job_seeker_profile = get_object_or_404(JobSeekerProfile, user=request.user)
     applications = JobApplication.objects.filter(
         applicant=job_seeker_profile
-    ).select_related('job', 'job__company').order_by('-applied_date')
+    ).select_related('job', 'job__company')
     
-    paginator = Paginator(applications, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = CursorPaginator(applications, 10, ordering=('-applied_date', '-id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     return render(request, 'jobs/my_applications.html', {'page_obj': page_obj})
 
@@ -435,14 +505,42 @@ def saved_jobs(request):
     job_seeker_profile = get_object_or_404(JobSeekerProfile, user=request.user)
     saved_jobs = SavedJob.objects.filter(
         user=job_seeker_profile
-    ).select_related('job', 'job__company').order_by('-saved_date')
+    ).select_related('job', 'job__company')
     
-    paginator = Paginator(saved_jobs, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = CursorPaginator(saved_jobs, 10, ordering=('-saved_date', '-id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
 
     return render(request, 'jobs/saved_jobs.html', {'page_obj': page_obj})
 
+@login_required
+@require_POST
+def save_search(request):
+    """Save the current job_list filters as a job alert"""
+    if request.user.user_type != 'job_seeker':
+        messages.error(request, 'Access denied. Job seekers only.')
+        return redirect('jobs:job_list')
+    
+    job_seeker_profile = get_object_or_404(JobSeekerProfile, user=request.user)
+    saved_search = create_saved_search(job_seeker_profile, request.GET, name=request.POST.get('name', ''))
+    if saved_search:
+        messages.success(request, f'Saved "{saved_search.name}". We will email you when new jobs match.')
+    else:
+        messages.error(request, 'This search could not be saved.')
+    return redirect(reverse('jobs:job_list') + '?' + request.GET.urlencode())
+
+@login_required
+@require_POST
+def delete_saved_search(request, pk):
+    """Stop alerts for a saved search"""
+    if request.user.user_type != 'job_seeker':
+        messages.error(request, 'Access denied. Job seekers only.')
+        return redirect('jobs:job_list')
+    
+    saved_search = get_object_or_404(SavedSearch, pk=pk, user__user=request.user)
+    saved_search.delete()
+    messages.success(request, 'Saved search removed.')
+    return redirect('accounts:job_seeker_dashboard')
+
 # Employer Application Management Views
 @login_required
 def job_applications(request, job_pk):
@@ -454,18 +552,32 @@ def job_applications(request, job_pk):
     employer_profile = get_object_or_404(EmployerProfile, user=request.user)
     job = get_object_or_404(Job, pk=job_pk, company=employer_profile)
     
-    applications = JobApplication.objects.filter(job=job).select_related(
-        'applicant__user'
-    ).order_by('-applied_date')
+    # Score applicants that are new or changed since the last visit (one bulk pass)
+    score_applications(job)
+    
+    applications = JobApplication.objects.filter(job=job).select_related('applicant__user')
     
     # Filter by status if specified
     status_filter = request.GET.get('status', '')
     if status_filter:
         applications = applications.filter(status=status_filter)
     
-    paginator = Paginator(applications, 15)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Only applicants at or above a match score
+    min_score = request.GET.get('min_score', '')
+    try:
+        applications = applications.filter(match_score__gte=float(min_score))
+    except ValueError:
+        min_score = ''
+    
+    sort = request.GET.get('sort', 'recent')
+    if sort == 'score':
+        ordering = ('-match_score', '-id')
+    else:
+        sort = 'recent'
+        ordering = ('-applied_date', '-id')
+    
+    paginator = CursorPaginator(applications, 15, ordering=ordering)
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     # Get application statistics
     app_stats = JobApplication.objects.filter(job=job).aggregate(
@@ -481,6 +593,8 @@ def job_applications(request, job_pk):
         'page_obj': page_obj,
         'app_stats': app_stats,
         'status_filter': status_filter,
+        'sort': sort,
+        'min_score': min_score,
     }
     
     return render(request, 'jobs/job_applications.html', context)
@@ -530,11 +644,11 @@ def bulk_update_applications(request):
     if not application_ids or not new_status:
         return JsonResponse({'error': 'Missing required parameters'}, status=400)
     
-    # Update applications
+    # Update applications (update() skips auto_now, so updated_date is set for change feeds)
     updated_count = JobApplication.objects.filter(
         id__in=application_ids,
         job__company=employer_profile
-    ).update(status=new_status)
+    ).update(status=new_status, updated_date=timezone.now())
     
     return JsonResponse({
         'success': True,
@@ -544,9 +658,7 @@ def bulk_update_applications(request):
 # Utility Views
 def job_categories(request):
     """List all job categories"""
-    categories = JobCategory.objects.annotate(
-        job_count=Count('job', filter=Q(job__status='active'))
-    ).order_by('name')
+    categories = JobCategory.objects.annotate(job_count=F('active_jobs_count')).order_by('name')
     
     return render(request, 'jobs/job_categories.html', {'categories': categories})
 
@@ -556,11 +668,10 @@ def jobs_by_category(request, pk):
     jobs = Job.objects.filter(
         category=category, 
         status='active'
-    ).select_related('company').order_by('-created_at')
+    ).select_related('company')
     
-    paginator = Paginator(jobs, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = CursorPaginator(jobs, 12, ordering=('-created_at', '-id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'category': category,
@@ -575,11 +686,10 @@ def jobs_by_company(request, pk):
     jobs = Job.objects.filter(
         company=company, 
         status='active'
-    ).order_by('-created_at')
+    ).select_related('company')
     
-    paginator = Paginator(jobs, 12)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    paginator = CursorPaginator(jobs, 12, ordering=('-created_at', '-id'))
+    page_obj = paginator.get_page(request.GET.get('cursor'))
     
     context = {
         'company': company,